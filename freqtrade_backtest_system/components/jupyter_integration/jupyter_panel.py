@@ -17,7 +17,7 @@ from utils.error_handling import ErrorHandler, error_handler
 
 # Handle optional imports with fallbacks
 try:
-    from .template_manager import JupyterTemplateManager
+    from .template_manager import JupyterTemplateManager, get_template_manager
 except ImportError:
     JupyterTemplateManager = None
     ErrorHandler.log_warning("JupyterTemplateManager not available, using fallback")
@@ -70,7 +70,7 @@ class JupyterAnalysisPanel:
         """Initialize Jupyter analysis panel"""
         # Initialize components with proper fallback handling
         if JupyterTemplateManager is not None:
-            self.template_manager = JupyterTemplateManager()
+            self.template_manager = get_template_manager()
         else:
             self.template_manager = None
             
@@ -194,22 +194,24 @@ class JupyterAnalysisPanel:
             st.warning("没有可用的分析模板")
             return
         
-        # Template selection
-        template_names = [t.name for t in templates]
-        selected_template = st.selectbox("选择模板", template_names)
+        # Template selection; keyed by file name so foo.ipynb and foo.md both stay listed
+        templates_by_file = {t.file_path.name: t for t in templates}
+        selected_file = st.selectbox("选择模板", list(templates_by_file))
         
-        if selected_template:
-            template = next(t for t in templates if t.name == selected_template)
+        if selected_file:
+            template = templates_by_file[selected_file]
+            # Both lookups take the suffix, or foo.md would resolve to foo.ipynb
+            template_suffix = template.file_path.suffix
             
             col1, col2 = st.columns([2, 1])
             
             with col1:
                 st.write(f"**描述:** {template.description}")
                 st.write(f"**类型:** {template.template_type}")
-                st.write(f"**参数:** {', '.join(template.parameters)}")
+                st.write(f"**参数:** {template.parameters_display}")
                 
                 # Show template info
-                template_info = self.template_manager.get_template_info(selected_template)
+                template_info = self.template_manager.get_template_info(template.name, template_suffix)
                 if template_info:
                     st.write(f"**创建时间:** {template_info['created']}")
                     st.write(f"**文件大小:** {template_info['size']} bytes")
@@ -219,14 +221,14 @@ class JupyterAnalysisPanel:
                 if st.button("📋 复制到工作空间"):
                     try:
                         import shutil
-                        dest_path = self.lab_integration.work_dir / "templates" / f"{selected_template}.ipynb"
+                        dest_path = self.lab_integration.work_dir / "templates" / template.file_path.name
                         shutil.copy2(template.file_path, dest_path)
                         st.success(f"模板已复制到: {dest_path}")
                     except Exception as e:
                         st.error(f"复制失败: {str(e)}")
                 
                 if st.button("🗑️ 删除模板"):
-                    if self.template_manager.delete_template(selected_template):
+                    if self.template_manager.delete_template(template.name, template_suffix):
                         st.success("模板已删除")
                         st.rerun()
                     else:
@@ -1,45 +1,307 @@
 """
 Automated report generation system (simplified version)
 """
+import os
+import copy
+import asyncio
+import html
 import json
+import hashlib
+import threading
+import weakref
+import re
+import multiprocessing
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Iterator, TextIO
 from datetime import datetime
+from itertools import repeat
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
 try:
     import nbformat
     from nbconvert import HTMLExporter, PDFExporter, MarkdownExporter
-    from nbconvert.preprocessors import ExecutePreprocessor
+    from jupyter_client import KernelManager
+    from nbclient import NotebookClient
     HAS_NBCONVERT = True
 except ImportError:
     HAS_NBCONVERT = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import jinja2
+    HAS_JINJA2 = True
+except ImportError:
+    HAS_JINJA2 = False
+
 from utils.data_models import BacktestResult
 from utils.error_handling import ErrorHandler, error_handler, ExecutionError
-from .template_manager import JupyterTemplateManager
+from .template_manager import JupyterTemplateManager, get_template_manager
+
+# Report templates; placeholders are plain ``{{ name }}`` substitutions so they
+# render identically with Jinja2 or with the regex fallback below
+_HTML_REPORT_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Strategy Report - {{ strategy_name }}</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        .header { background: #f0f8ff; padding: 20px; border-radius: 8px; }
+        .metrics { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin: 20px 0; }
+        .metric-card { background: white; border: 1px solid #ddd; padding: 15px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        .metric-value { font-size: 24px; font-weight: bold; color: #1f77b4; }
+        .metric-label { color: #666; margin-top: 5px; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>📈 Strategy Analysis Report</h1>
+        <h2>{{ strategy_name }}</h2>
+        <p>Generated: {{ generated }}</p>
+    </div>
+    
+    <h3>📊 Performance Metrics</h3>
+    <div class="metrics">
+        <div class="metric-card">
+            <div class="metric-value">{{ total_return_pct }}%</div>
+            <div class="metric-label">Total Return</div>
+        </div>
+        <div class="metric-card">
+            <div class="metric-value">{{ win_rate }}%</div>
+            <div class="metric-label">Win Rate</div>
+        </div>
+        <div class="metric-card">
+            <div class="metric-value">{{ max_drawdown_pct }}%</div>
+            <div class="metric-label">Max Drawdown</div>
+        </div>
+        <div class="metric-card">
+            <div class="metric-value">{{ sharpe_ratio }}</div>
+            <div class="metric-label">Sharpe Ratio</div>
+        </div>
+        <div class="metric-card">
+            <div class="metric-value">{{ total_trades }}</div>
+            <div class="metric-label">Total Trades</div>
+        </div>
+        <div class="metric-card">
+            <div class="metric-value">{{ avg_profit }}</div>
+            <div class="metric-label">Avg Profit</div>
+        </div>
+    </div>
+    
+    <h3>📋 Configuration</h3>
+    <pre>{{ config_json }}</pre>
+    
+    <h3>📊 Raw Data</h3>
+    <details>
+        <summary>Click to view raw data</summary>
+        <pre>{{ raw_json }}</pre>
+    </details>
+</body>
+</html>
+"""
+
+_MARKDOWN_REPORT_TEMPLATE = """# 📈 Strategy Analysis Report
+
+## {{ strategy_name }}
+
+**Generated:** {{ generated }}
+
+## 📊 Performance Metrics
+
+| Metric | Value |
+|--------|-------|
+| Total Return | {{ total_return_pct }}% |
+| Win Rate | {{ win_rate }}% |
+| Max Drawdown | {{ max_drawdown_pct }}% |
+| Sharpe Ratio | {{ sharpe_ratio }} |
+| Total Trades | {{ total_trades }} |
+| Average Profit | {{ avg_profit }} |
+
+## 📋 Configuration
+
+```json
+{{ config_json }}
+```
+
+## 📊 Summary
+
+This report was generated for strategy **{{ strategy_name }}** with the following key findings:
+
+- **Performance:** {{ performance_label }} return of {{ total_return_pct }}%
+- **Risk:** Maximum drawdown of {{ max_drawdown_pct }}%
+- **Consistency:** Win rate of {{ win_rate }}% over {{ total_trades }} trades
+- **Risk-Adjusted Return:** Sharpe ratio of {{ sharpe_ratio }}
+
+## 📊 Raw Data
+
+<details>
+<summary>Click to view raw data</summary>
+
+```json
+{{ raw_json }}
+```
+
+</details>
+"""
+
+_REPORT_TEMPLATES = {
+    'html': _HTML_REPORT_TEMPLATE,
+    'markdown': _MARKDOWN_REPORT_TEMPLATE
+}
+
+# Jinja2 loops over the raw-data JSON pieces, so the full string is never joined
+_RAW_JSON_PLACEHOLDER = '{{ raw_json }}'
+_RAW_JSON_LOOP = '{% for piece in raw_json %}{{ piece }}{% endfor %}'
+
+_PLACEHOLDER_RE = re.compile(r'\{\{ (\w+) \}\}')
+
+# Templates pre-split into alternating literal text and placeholder names, so
+# rendering without Jinja2 is a single join instead of a regex pass per report
+_REPORT_TEMPLATE_SEGMENTS = {
+    name: _PLACEHOLDER_RE.split(template) for name, template in _REPORT_TEMPLATES.items()
+}
+
+# Each notebook report worker runs its own kernel, so keep those batches small
+_MAX_NOTEBOOK_WORKERS = 2
+
+# Number of parsed notebooks kept in memory by ReportGenerator._read_notebook
+_NB_PARSE_CACHE_SIZE = 32
+
+# Number of (result, format) report paths kept in the in-memory LRU
+_REPORT_LRU_SIZE = 128
+
+# Content-addressed report index: an append-only journal of [cache_key, path]
+# lines, compacted when loaded and capped to the newest entries
+_REPORT_INDEX_NAME = '.cache_index.jsonl'
+_REPORT_INDEX_SIZE = 512
+
+# Hex digits of the cache key appended to report file names; reports written in
+# the same second for different content must not share a file
+_REPORT_NAME_DIGEST_LENGTH = 12
+
+def _render_segments(segments: List[str], context: Dict[str, Any]) -> str:
+    """Fill pre-split template segments (odd positions are placeholder names)"""
+    parts = segments[:]
+    for i in range(1, len(parts), 2):
+        value = context[parts[i]]
+        parts[i] = value if isinstance(value, str) else ''.join(value)
+    return ''.join(parts)
+
+def _escape_html(text: str) -> str:
+    """Escape text embedded in HTML element content"""
+    return html.escape(text, quote=False)
+
+def _no_escape(text: str) -> str:
+    """Return text unchanged"""
+    return text
+
+def _dumps_json_bytes(data: Any) -> bytes:
+    """Serialize data to indented UTF-8 JSON, using orjson when available"""
+    if HAS_ORJSON:
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _dumps_json(data: Any) -> str:
+    """Serialize data to an indented JSON string"""
+    return _dumps_json_bytes(data).decode('utf-8')
+
+def _iter_json_with_fragments(data: Dict[str, Any], fragments: Dict[str, str]) -> Iterator[str]:
+    """
+    Serialize a top-level dict piece by piece, splicing in already-serialized values
+    Args:
+        data: dict to serialize
+        fragments: pre-serialized (indented) JSON keyed by top-level key
+    Returns:
+        iterator of pieces that join to the same string as _dumps_json(data)
+    """
+    if not data:
+        yield '{}'
+        return
+    
+    separator = '{\n'
+    for key, value in data.items():
+        fragment = fragments[key] if key in fragments else _dumps_json(value)
+        yield separator
+        yield f"  {_dumps_json(key)}: "
+        # Nest the fragment one indent level deeper
+        yield fragment.replace('\n', '\n  ')
+        separator = ',\n'
+    yield '\n}'
 
 class ReportGenerator:
     """Automated report generation system"""
     
-    def __init__(self, template_manager: JupyterTemplateManager = None):
+    def __init__(self, template_manager: JupyterTemplateManager = None, persist_cache_index: bool = True):
         """
         Initialize report generator
         Args:
             template_manager: template manager instance
+            persist_cache_index: write new cache index entries to disk; batch workers
+                leave that to the parent, which collects them from _pending_index_entries
         """
-        self.template_manager = template_manager or JupyterTemplateManager()
+        self.template_manager = template_manager or get_template_manager()
         self.reports_dir = Path("reports")
         self.reports_dir.mkdir(exist_ok=True)
         
-        # Supported output formats
+        # Supported output formats; exporters are constructed on first use
         if HAS_NBCONVERT:
-            self.exporters = {
-                'html': HTMLExporter(),
-                'pdf': PDFExporter(),
-                'markdown': MarkdownExporter()
+            self._exporter_factories = {
+                'html': HTMLExporter,
+                'pdf': PDFExporter,
+                'markdown': MarkdownExporter
             }
         else:
-            self.exporters = {}
+            self._exporter_factories = {}
+        self._exporters = {}
+        
+        # Compile report templates once per instance
+        self._report_templates = self._build_report_templates()
+        
+        # Kernel and client shared by notebook executions, started on first use
+        self._kernel_manager = None
+        self._kernel_client = None
+        
+        # Parsed notebooks keyed by (path, mtime_ns)
+        self._nb_parse_cache: Dict[tuple, Any] = {}
+        
+        # LRU of report paths keyed by result identity, checked before any work;
+        # a BacktestResult is treated as immutable once a report exists for it
+        self._report_lru: 'OrderedDict[tuple, tuple]' = OrderedDict()
+        self._report_lru_lock = threading.Lock()
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        
+        # Content-addressed index of generated reports, persisted across restarts
+        self._cache_index_path = self.reports_dir / _REPORT_INDEX_NAME
+        self._persist_cache_index = persist_cache_index
+        self._pending_index_entries: List[tuple] = []
+        self._report_cache = self._load_report_cache()
+    
+    def _build_report_templates(self) -> Dict[str, Any]:
+        """Compile the HTML/Markdown report templates with Jinja2"""
+        if not HAS_JINJA2:
+            return {}
+        
+        cache_dir = self.reports_dir / '.jinja_cache'
+        cache_dir.mkdir(exist_ok=True)
+        env = jinja2.Environment(
+            loader=jinja2.DictLoader({
+                name: template.replace(_RAW_JSON_PLACEHOLDER, _RAW_JSON_LOOP)
+                for name, template in _REPORT_TEMPLATES.items()
+            }),
+            bytecode_cache=jinja2.FileSystemBytecodeCache(str(cache_dir)),
+            auto_reload=False,
+            keep_trailing_newline=True
+        )
+        return {name: env.get_template(name) for name in _REPORT_TEMPLATES}
     
     @error_handler(Exception, show_error=True)
     def generate_strategy_report(self, 
@@ -55,8 +317,45 @@ class ReportGenerator:
         Returns:
             path to generated report
         """
+        job = self._prepare_report(result, output_format, include_trades)
+        if isinstance(job, Path):
+            return job
+        
+        # Generate report based on format
+        data, now, report_name = job['data'], job['now'], job['report_name']
+        if output_format == 'json':
+            report_path = self._generate_json_report(data, report_name, job['trades'], job['fragments'])
+        elif HAS_NBCONVERT and output_format in self._exporter_factories:
+            report_path = self._generate_notebook_report(data, report_name, output_format, now)
+        else:
+            report_path = self._generate_simple_report(data, report_name, output_format, now, job['fragments'])
+        
+        return self._finish_report(job, report_path)
+    
+    def _prepare_report(self, result: BacktestResult, output_format: str, include_trades: bool) -> Any:
+        """
+        Build the report payload, or find an existing report for it
+        Args:
+            result: backtest result
+            output_format: output format
+            include_trades: whether to include trade details
+        Returns:
+            path of a cached report, or a job dict for _finish_report
+        """
+        lru_key = (id(result), output_format, include_trades)
+        lru_path = self._lru_get(lru_key, result)
+        if lru_path:
+            ErrorHandler.log_info(f"Reusing report for {result.strategy_name}: {lru_path}")
+            return lru_path
+        
         ErrorHandler.log_info(f"Generating strategy report for {result.strategy_name}")
         
+        # One timestamp shared by the report file name and its body
+        now = datetime.now()
+        
+        # JSON reports stream trades straight to disk instead of building the list
+        stream_trades = output_format == 'json'
+        
         # Prepare data for template
         data = {
             'strategy_name': result.strategy_name,
@@ -76,184 +375,389 @@ class ReportGenerator:
                 'execution_time': result.execution_time
             },
             'config_data': result.config.to_dict() if result.config else {},
-            'trades_data': [trade.to_dict() for trade in result.trades] if include_trades else []
+            'trades_data': [trade.to_dict() for trade in result.trades] if include_trades and not stream_trades else []
         }
         
-        # Generate report based on format
-        if output_format == 'json':
-            return self._generate_json_report(data, result.strategy_name)
-        elif HAS_NBCONVERT and output_format in self.exporters:
-            return self._generate_notebook_report(data, result.strategy_name, output_format)
-        else:
-            return self._generate_simple_report(data, result.strategy_name, output_format)
+        # Serialize each top-level member once; the cache key, the JSON writer
+        # and the report templates all reuse these fragments
+        fragments = {key: _dumps_json(value) for key, value in data.items()}
+        
+        # Streamed trades are likewise encoded once, then hashed and written as-is
+        trades = [_dumps_json_bytes(trade.to_dict()) for trade in result.trades] if include_trades and stream_trades else []
+        
+        # Reuse a previously generated report for identical content
+        cache_key = self._report_cache_key(fragments, trades, output_format)
+        cached_path = self._get_cached_report(cache_key)
+        if cached_path:
+            ErrorHandler.log_info(f"Reusing cached report: {cached_path}")
+            self._lru_put(lru_key, result, cached_path)
+            return cached_path
+        
+        return {
+            'result': result,
+            'lru_key': lru_key,
+            'cache_key': cache_key,
+            'report_name': f"{result.strategy_name}_report_{now.strftime('%Y%m%d_%H%M%S')}_{cache_key[:_REPORT_NAME_DIGEST_LENGTH]}",
+            'now': now,
+            'data': data,
+            'fragments': fragments,
+            'trades': trades
+        }
+    
+    def _finish_report(self, job: Dict[str, Any], report_path: Optional[Path]) -> Optional[Path]:
+        """Record a newly generated report in the caches"""
+        if report_path:
+            self._store_cached_report(job['cache_key'], report_path)
+            self._lru_put(job['lru_key'], job['result'], report_path)
+        return report_path
+    
+    def _lru_get(self, key: tuple, result: BacktestResult) -> Optional[Path]:
+        """Look up a report path for this exact result object"""
+        with self._report_lru_lock:
+            entry = self._report_lru.get(key)
+            # The weakref guards against a recycled id() of a collected result
+            if entry and entry[0]() is result and entry[1].is_file():
+                self._report_lru.move_to_end(key)
+                self.cache_stats['hits'] += 1
+                return entry[1]
+            self._report_lru.pop(key, None)
+            self.cache_stats['misses'] += 1
+            return None
+    
+    def _lru_put(self, key: tuple, result: BacktestResult, report_path: Path):
+        """Remember the report path for a result, evicting the oldest entry"""
+        with self._report_lru_lock:
+            self._report_lru[key] = (weakref.ref(result), report_path)
+            self._report_lru.move_to_end(key)
+            while len(self._report_lru) > _REPORT_LRU_SIZE:
+                self._report_lru.popitem(last=False)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get report LRU statistics"""
+        with self._report_lru_lock:
+            total_requests = self.cache_stats['hits'] + self.cache_stats['misses']
+            return {
+                'hit_rate': self.cache_stats['hits'] / total_requests if total_requests > 0 else 0,
+                'total_requests': total_requests,
+                'hits': self.cache_stats['hits'],
+                'misses': self.cache_stats['misses'],
+                'size': len(self._report_lru),
+                'max_size': _REPORT_LRU_SIZE
+            }
+    
+    def _report_cache_key(self, fragments: Dict[str, str], trades: Iterable[bytes], output_format: str) -> str:
+        """Hash serialized report content (top-level fragments and encoded trades) and format into a cache key"""
+        digest = hashlib.blake2b(digest_size=16)
+        for key, fragment in fragments.items():
+            digest.update(key.encode('utf-8'))
+            digest.update(fragment.encode('utf-8'))
+        for trade in trades:
+            digest.update(trade)
+        return f"{digest.hexdigest()}:{output_format}"
+    
+    def _load_report_cache(self) -> Dict[str, str]:
+        """
+        Load the persisted report cache index
+        Returns:
+            cache key to report path, oldest first, for reports that still exist
+        """
+        try:
+            raw = self._cache_index_path.read_bytes()
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            ErrorHandler.log_warning(f"Ignoring unreadable report cache index: {str(e)}")
+            return {}
+        
+        entries = {}
+        lines = raw.splitlines()
+        for line in lines:
+            try:
+                cache_key, report_path = json.loads(line)
+            except (ValueError, TypeError):
+                # A torn line from an interrupted append only loses that entry
+                continue
+            # Later lines win and count as the most recent use
+            entries.pop(cache_key, None)
+            entries[cache_key] = report_path
+        
+        live = [(key, path) for key, path in entries.items() if os.path.isfile(path)][-_REPORT_INDEX_SIZE:]
+        if len(live) < len(lines) and self._persist_cache_index:
+            self._write_report_cache(live)
+        return dict(live)
+    
+    def _write_report_cache(self, entries: List[tuple]):
+        """Rewrite the cache index with only the given entries, atomically"""
+        payload = ''.join(json.dumps([key, path]) + '\n' for key, path in entries).encode('utf-8')
+        tmp_path = self._cache_index_path.with_name(f"{self._cache_index_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, self._cache_index_path)
+        except Exception as e:
+            ErrorHandler.log_warning(f"Error compacting report cache index: {str(e)}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+    
+    def _get_cached_report(self, cache_key: str) -> Optional[Path]:
+        """Get a cached report path if the report file still exists"""
+        cached = self._report_cache.get(cache_key)
+        if cached and Path(cached).is_file():
+            return Path(cached)
+        self._report_cache.pop(cache_key, None)
+        return None
+    
+    def _store_cached_report(self, cache_key: str, report_path: Path):
+        """Record a generated report in the cache index"""
+        self._report_cache.pop(cache_key, None)
+        self._report_cache[cache_key] = str(report_path)
+        while len(self._report_cache) > _REPORT_INDEX_SIZE:
+            del self._report_cache[next(iter(self._report_cache))]
+        
+        if not self._persist_cache_index:
+            self._pending_index_entries.append((cache_key, str(report_path)))
+            return
+        
+        # Append one line instead of rewriting the index; a single small O_APPEND
+        # write does not interleave with appends from batch worker processes
+        line = (json.dumps([cache_key, str(report_path)]) + '\n').encode('utf-8')
+        try:
+            with open(self._cache_index_path, 'ab') as f:
+                f.write(line)
+        except Exception as e:
+            ErrorHandler.log_warning(f"Error saving report cache index: {str(e)}")
+    
+    def generate_strategy_reports(self,
+                                  results: List[BacktestResult],
+                                  output_format: str = 'html',
+                                  include_trades: bool = True,
+                                  max_workers: Optional[int] = None) -> List[Optional[Path]]:
+        """
+        Generate strategy reports for several results in parallel processes
+        Args:
+            results: backtest results
+            output_format: output format (html, pdf, markdown, json)
+            include_trades: whether to include trade details
+            max_workers: maximum number of worker processes (None for CPU count)
+        Returns:
+            report paths in the order of results (None for failed reports)
+        """
+        if not results:
+            return []
+        
+        workers = max_workers or os.cpu_count() or 1
+        if HAS_NBCONVERT and output_format in self._exporter_factories:
+            workers = min(workers, _MAX_NOTEBOOK_WORKERS)
+        workers = min(workers, len(results))
+        
+        if workers == 1:
+            return [self.generate_strategy_report(result, output_format, include_trades) for result in results]
+        
+        # The same result object listed twice is generated once, so no two workers
+        # write the same report file
+        unique_results = list({id(result): result for result in results}.values())
+        workers = min(workers, len(unique_results))
+        
+        ErrorHandler.log_info(f"Generating {len(unique_results)} strategy reports with {workers} workers")
+        try:
+            # Spawn rather than fork: a forked child inherits this process's kernel
+            # client/zmq state and hangs when it starts its own kernel
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+                outcomes = list(executor.map(_generate_one, unique_results, repeat(output_format), repeat(include_trades)))
+        except Exception as e:
+            ErrorHandler.log_error(f"Batch report generation failed: {str(e)}")
+            raise
+        
+        # Workers only report their new index entries; this process is the single writer
+        paths = {}
+        for result, (report_path, index_entries) in zip(unique_results, outcomes):
+            for cache_key, path in index_entries:
+                self._store_cached_report(cache_key, Path(path))
+            paths[id(result)] = report_path
+        return [paths[id(result)] for result in results]
+    
+    async def generate_strategy_reports_async(self,
+                                              results: List[BacktestResult],
+                                              output_format: str = 'html',
+                                              include_trades: bool = True,
+                                              max_concurrency: Optional[int] = None) -> List[Optional[Path]]:
+        """
+        Generate strategy reports with notebooks executed concurrently
+        Args:
+            results: backtest results
+            output_format: output format (html, pdf, markdown, json)
+            include_trades: whether to include trade details
+            max_concurrency: maximum number of kernels running at once
+        Returns:
+            report paths in the order of results (None for failed reports)
+        """
+        if not (HAS_NBCONVERT and output_format in self._exporter_factories):
+            # Nothing to overlap without notebook execution
+            return [self.generate_strategy_report(result, output_format, include_trades) for result in results]
+        
+        semaphore = asyncio.Semaphore(max_concurrency or _MAX_NOTEBOOK_WORKERS)
+        
+        async def generate(result: BacktestResult) -> Optional[Path]:
+            async with semaphore:
+                return await self._generate_strategy_report_async(result, output_format, include_trades)
+        
+        return list(await asyncio.gather(*(generate(result) for result in results)))
+    
+    async def _generate_strategy_report_async(self, result: BacktestResult, output_format: str,
+                                              include_trades: bool) -> Optional[Path]:
+        """Generate one notebook-based report, awaiting notebook execution"""
+        try:
+            job = self._prepare_report(result, output_format, include_trades)
+            if isinstance(job, Path):
+                return job
+            
+            report_path = await self._generate_notebook_report_async(
+                job['data'], job['report_name'], output_format, job['now']
+            )
+            return self._finish_report(job, report_path)
+        except Exception as e:
+            ErrorHandler.log_error(f"Error generating report for {result.strategy_name}: {str(e)}")
+            return None
     
-    def _generate_json_report(self, data: Dict[str, Any], strategy_name: str) -> Path:
+    def _generate_json_report(self, data: Dict[str, Any], report_name: str,
+                              trades: Iterable[bytes] = (),
+                              fragments: Optional[Dict[str, str]] = None) -> Path:
         """Generate JSON report"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        report_path = self.reports_dir / f"{strategy_name}_report_{timestamp}.json"
+        report_path = self.reports_dir / f"{report_name}.json"
         
-        with open(report_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        self._dump_json_streaming(report_path, data, trades, fragments or {})
         
         ErrorHandler.log_info(f"JSON report generated: {report_path}")
         return report_path
     
-    def _generate_simple_report(self, data: Dict[str, Any], strategy_name: str, output_format: str) -> Path:
+    def _dump_json_streaming(self, report_path: Path, data: Dict[str, Any], trades: Iterable[bytes],
+                             fragments: Dict[str, str]):
+        """
+        Write report data as JSON, writing trades one at a time
+        Args:
+            report_path: output file
+            data: report data; its 'trades_data' entry is replaced by the streamed trades
+            trades: encoded trade records (indented JSON) to write under 'trades_data'
+            fragments: pre-serialized JSON for top-level keys of data
+        """
+        with open(report_path, 'wb') as f:
+            f.write(b'{\n')
+            for key, value in data.items():
+                if key == 'trades_data':
+                    continue
+                fragment = fragments[key].encode('utf-8') if key in fragments else _dumps_json_bytes(value)
+                fragment = fragment.replace(b'\n', b'\n  ')
+                f.write(b'  ' + _dumps_json_bytes(key) + b': ' + fragment + b',\n')
+            
+            f.write(b'  "trades_data": [')
+            has_trades = False
+            for trade in trades:
+                f.write(b',\n    ' if has_trades else b'\n    ')
+                f.write(trade.replace(b'\n', b'\n    '))
+                has_trades = True
+            f.write(b'\n  ]\n}' if has_trades else b']\n}')
+    
+    def _generate_simple_report(self, data: Dict[str, Any], report_name: str, output_format: str,
+                                now: datetime, fragments: Optional[Dict[str, str]] = None) -> Path:
         """Generate simple text-based report"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
         if output_format == 'html':
-            report_path = self.reports_dir / f"{strategy_name}_report_{timestamp}.html"
-            content = self._create_html_report(data)
+            template_name = 'html'
+            report_path = self.reports_dir / f"{report_name}.html"
         else:
-            report_path = self.reports_dir / f"{strategy_name}_report_{timestamp}.md"
-            content = self._create_markdown_report(data)
+            template_name = 'markdown'
+            report_path = self.reports_dir / f"{report_name}.md"
         
+        # Render section by section into the file rather than building one large string
+        context = self._build_report_context(template_name, data, now, fragments)
         with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+            self._write_report_template(f, template_name, context)
         
         ErrorHandler.log_info(f"Simple report generated: {report_path}")
         return report_path
     
-    def _create_html_report(self, data: Dict[str, Any]) -> str:
-        """Create HTML report content"""
-        strategy_name = data['strategy_name']
+    def _build_report_context(self, template_name: str, data: Dict[str, Any], now: datetime,
+                              fragments: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Build the pre-formatted values substituted into the report templates
+        Args:
+            template_name: 'html' or 'markdown'; HTML values are escaped
+            data: report data
+            now: report timestamp
+            fragments: pre-serialized JSON for top-level keys of data
+        Returns:
+            template context; raw_json is an iterator of escaped pieces, used once
+        """
         metrics = data['results_data']['metrics']
+        fragments = dict(fragments or {})
+        if 'config_data' not in fragments:
+            fragments['config_data'] = _dumps_json(data['config_data'])
+        # Escape free text for HTML; Markdown embeds it verbatim in code fences
+        escape = _escape_html if template_name == 'html' else _no_escape
         
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Strategy Report - {strategy_name}</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; }}
-        .header {{ background: #f0f8ff; padding: 20px; border-radius: 8px; }}
-        .metrics {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin: 20px 0; }}
-        .metric-card {{ background: white; border: 1px solid #ddd; padding: 15px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-        .metric-value {{ font-size: 24px; font-weight: bold; color: #1f77b4; }}
-        .metric-label {{ color: #666; margin-top: 5px; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>📈 Strategy Analysis Report</h1>
-        <h2>{strategy_name}</h2>
-        <p>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-    </div>
+        # Escaping is per character, so the pieces can be escaped one at a time
+        raw_json = map(escape, _iter_json_with_fragments(data, fragments))
+        
+        return {
+            'strategy_name': escape(data['strategy_name']),
+            'generated': now.strftime('%Y-%m-%d %H:%M:%S'),
+            'total_return_pct': f"{metrics['total_return_pct']:.2f}",
+            'win_rate': f"{metrics['win_rate']:.2f}",
+            'max_drawdown_pct': f"{metrics['max_drawdown_pct']:.2f}",
+            'sharpe_ratio': f"{metrics['sharpe_ratio']:.3f}",
+            'total_trades': str(metrics['total_trades']),
+            'avg_profit': f"{metrics['avg_profit']:.2f}",
+            'performance_label': 'Positive' if metrics['total_return_pct'] > 0 else 'Negative',
+            'config_json': escape(fragments['config_data']),
+            'raw_json': raw_json
+        }
     
-    <h3>📊 Performance Metrics</h3>
-    <div class="metrics">
-        <div class="metric-card">
-            <div class="metric-value">{metrics['total_return_pct']:.2f}%</div>
-            <div class="metric-label">Total Return</div>
-        </div>
-        <div class="metric-card">
-            <div class="metric-value">{metrics['win_rate']:.2f}%</div>
-            <div class="metric-label">Win Rate</div>
-        </div>
-        <div class="metric-card">
-            <div class="metric-value">{metrics['max_drawdown_pct']:.2f}%</div>
-            <div class="metric-label">Max Drawdown</div>
-        </div>
-        <div class="metric-card">
-            <div class="metric-value">{metrics['sharpe_ratio']:.3f}</div>
-            <div class="metric-label">Sharpe Ratio</div>
-        </div>
-        <div class="metric-card">
-            <div class="metric-value">{metrics['total_trades']}</div>
-            <div class="metric-label">Total Trades</div>
-        </div>
-        <div class="metric-card">
-            <div class="metric-value">{metrics['avg_profit']:.2f}</div>
-            <div class="metric-label">Avg Profit</div>
-        </div>
-    </div>
+    def _render_report_template(self, template_name: str, context: Dict[str, str]) -> str:
+        """Render a report template, using Jinja2 when available"""
+        if self._report_templates:
+            return self._report_templates[template_name].render(**context)
+        return _render_segments(_REPORT_TEMPLATE_SEGMENTS[template_name], context)
     
-    <h3>📋 Configuration</h3>
-    <pre>{json.dumps(data['config_data'], indent=2)}</pre>
+    def _write_report_template(self, f: TextIO, template_name: str, context: Dict[str, Any]):
+        """Render a report template directly into an open text file"""
+        if self._report_templates:
+            self._report_templates[template_name].stream(**context).dump(f)
+            return
+        
+        segments = _REPORT_TEMPLATE_SEGMENTS[template_name]
+        for i, segment in enumerate(segments):
+            value = context[segment] if i % 2 else segment
+            if isinstance(value, str):
+                f.write(value)
+            else:
+                f.writelines(value)
     
-    <h3>📊 Raw Data</h3>
-    <details>
-        <summary>Click to view raw data</summary>
-        <pre>{json.dumps(data, indent=2)}</pre>
-    </details>
-</body>
-</html>
-"""
-        return html_content
+    def _create_html_report(self, data: Dict[str, Any], now: datetime,
+                            fragments: Optional[Dict[str, str]] = None) -> str:
+        """Create HTML report content"""
+        return self._render_report_template('html', self._build_report_context('html', data, now, fragments))
     
-    def _create_markdown_report(self, data: Dict[str, Any]) -> str:
+    def _create_markdown_report(self, data: Dict[str, Any], now: datetime,
+                                fragments: Optional[Dict[str, str]] = None) -> str:
         """Create Markdown report content"""
-        strategy_name = data['strategy_name']
-        metrics = data['results_data']['metrics']
-        
-        markdown_content = f"""# 📈 Strategy Analysis Report
-
-## {strategy_name}
-
-**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-## 📊 Performance Metrics
-
-| Metric | Value |
-|--------|-------|
-| Total Return | {metrics['total_return_pct']:.2f}% |
-| Win Rate | {metrics['win_rate']:.2f}% |
-| Max Drawdown | {metrics['max_drawdown_pct']:.2f}% |
-| Sharpe Ratio | {metrics['sharpe_ratio']:.3f} |
-| Total Trades | {metrics['total_trades']} |
-| Average Profit | {metrics['avg_profit']:.2f} |
-
-## 📋 Configuration
-
-```json
-{json.dumps(data['config_data'], indent=2)}
-```
-
-## 📊 Summary
-
-This report was generated for strategy **{strategy_name}** with the following key findings:
-
-- **Performance:** {'Positive' if metrics['total_return_pct'] > 0 else 'Negative'} return of {metrics['total_return_pct']:.2f}%
-- **Risk:** Maximum drawdown of {metrics['max_drawdown_pct']:.2f}%
-- **Consistency:** Win rate of {metrics['win_rate']:.2f}% over {metrics['total_trades']} trades
-- **Risk-Adjusted Return:** Sharpe ratio of {metrics['sharpe_ratio']:.3f}
-
-## 📊 Raw Data
-
-<details>
-<summary>Click to view raw data</summary>
-
-```json
-{json.dumps(data, indent=2)}
-```
-
-</details>
-"""
-        return markdown_content
+        return self._render_report_template('markdown', self._build_report_context('markdown', data, now, fragments))
     
-    def _generate_notebook_report(self, data: Dict[str, Any], strategy_name: str, output_format: str) -> Optional[Path]:
+    def _generate_notebook_report(self, data: Dict[str, Any], report_name: str, output_format: str,
+                                  now: datetime) -> Optional[Path]:
         """Generate notebook-based report (when nbconvert is available)"""
         if not HAS_NBCONVERT:
             ErrorHandler.log_warning("nbconvert not available, falling back to simple report")
-            return self._generate_simple_report(data, strategy_name, output_format)
+            return self._generate_simple_report(data, report_name, output_format, now)
         
         try:
             # Create notebook from template
-            notebook_path = self.template_manager.create_analysis_notebook(
-                'strategy_analysis',
-                data,
-                f"{strategy_name}_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            )
-            
-            if not notebook_path:
-                raise ExecutionError("Failed to create analysis notebook")
+            notebook_path = self._create_report_notebook(data, report_name)
             
             # Execute notebook
             executed_notebook = self._execute_notebook(notebook_path)
             
             # Convert to desired format
-            report_path = self._convert_notebook(executed_notebook, output_format, strategy_name)
+            report_path = self._convert_notebook(executed_notebook, output_format, report_name)
             
             ErrorHandler.log_info(f"Notebook report generated: {report_path}")
             return report_path
@@ -261,7 +765,35 @@ This report was generated for strategy **{strategy_name}** with the following ke
         except Exception as e:
             ErrorHandler.log_error(f"Error generating notebook report: {str(e)}")
             # Fallback to simple report
-            return self._generate_simple_report(data, strategy_name, output_format)
+            return self._generate_simple_report(data, report_name, output_format, now)
+    
+    async def _generate_notebook_report_async(self, data: Dict[str, Any], report_name: str, output_format: str,
+                                              now: datetime) -> Optional[Path]:
+        """Generate notebook-based report, executing the notebook asynchronously"""
+        try:
+            notebook_path = self._create_report_notebook(data, report_name)
+            executed_notebook = await self._execute_notebook_async(notebook_path)
+            report_path = self._convert_notebook(executed_notebook, output_format, report_name)
+            
+            ErrorHandler.log_info(f"Notebook report generated: {report_path}")
+            return report_path
+            
+        except Exception as e:
+            ErrorHandler.log_error(f"Error generating notebook report: {str(e)}")
+            # Fallback to simple report
+            return self._generate_simple_report(data, report_name, output_format, now)
+    
+    def _create_report_notebook(self, data: Dict[str, Any], report_name: str) -> Path:
+        """Create the analysis notebook for a report from its template"""
+        notebook_path = self.template_manager.create_analysis_notebook(
+            'strategy_analysis',
+            data,
+            report_name
+        )
+        
+        if not notebook_path:
+            raise ExecutionError("Failed to create analysis notebook")
+        return notebook_path
     
     def _execute_notebook(self, notebook_path: Path) -> Path:
         """Execute notebook and return path to executed version"""
@@ -270,37 +802,163 @@ This report was generated for strategy **{strategy_name}** with the following ke
             
         try:
             # Read notebook
-            with open(notebook_path, 'r', encoding='utf-8') as f:
-                nb = nbformat.read(f, as_version=4)
+            nb = self._read_notebook(notebook_path)
             
-            # Execute notebook
-            ep = ExecutePreprocessor(timeout=600, kernel_name='python3')
-            ep.preprocess(nb, {'metadata': {'path': str(notebook_path.parent)}})
+            # Execute notebook on the shared kernel through the shared client; a
+            # client passed in is not stopped by nbclient, so one is kept for all runs
+            kernel_manager, kernel_client = self._get_kernel(notebook_path.parent)
+            client = NotebookClient(nb, timeout=600, kernel_name='python3', km=kernel_manager,
+                                    resources={'metadata': {'path': str(notebook_path.parent)}})
+            client.kc = kernel_client
+            try:
+                client.execute()
+            except Exception:
+                # A failed cell or timeout can leave the kernel busy or half-initialised;
+                # start the next report on a fresh kernel instead of reusing it
+                self.close()
+                raise
+            
+            return self._save_executed_notebook(notebook_path, nb)
+            
+        except Exception as e:
+            ErrorHandler.log_error(f"Error executing notebook: {str(e)}")
+            # Return original notebook if execution fails
+            return notebook_path
+    
+    async def _execute_notebook_async(self, notebook_path: Path) -> Path:
+        """Execute notebook on its own kernel without blocking the event loop"""
+        try:
+            nb = self._read_notebook(notebook_path)
             
-            # Save executed notebook
-            executed_path = notebook_path.parent / f"executed_{notebook_path.name}"
-            with open(executed_path, 'w', encoding='utf-8') as f:
-                nbformat.write(nb, f)
+            client = NotebookClient(nb, timeout=600, kernel_name='python3',
+                                    resources={'metadata': {'path': str(notebook_path.parent)}})
+            await client.async_execute()
             
-            return executed_path
+            return self._save_executed_notebook(notebook_path, nb)
             
         except Exception as e:
             ErrorHandler.log_error(f"Error executing notebook: {str(e)}")
             # Return original notebook if execution fails
             return notebook_path
     
-    def _convert_notebook(self, notebook_path: Path, output_format: str, base_name: str) -> Path:
+    def _save_executed_notebook(self, notebook_path: Path, nb: Any) -> Path:
+        """Save an executed notebook next to its source and return its path"""
+        executed_path = notebook_path.parent / f"executed_{notebook_path.name}"
+        executed_path.write_text(nbformat.writes(nb), encoding='utf-8')
+        
+        # Hand the executed node to _convert_notebook without re-parsing it
+        self._cache_notebook(executed_path, nb)
+        
+        return executed_path
+    
+    def _read_notebook(self, notebook_path: Path, mutable: bool = True) -> Any:
+        """
+        Read a notebook, reusing the parsed node while the file is unchanged
+        Args:
+            notebook_path: notebook file
+            mutable: return a private copy that the caller may modify
+        Returns:
+            parsed notebook node
+        """
+        key = (str(notebook_path), notebook_path.stat().st_mtime_ns)
+        nb = self._nb_parse_cache.get(key)
+        if nb is None:
+            nb = nbformat.reads(notebook_path.read_text(encoding='utf-8'), as_version=4)
+            self._nb_parse_cache[key] = nb
+            self._trim_notebook_cache()
+        return copy.deepcopy(nb) if mutable else nb
+    
+    def _cache_notebook(self, notebook_path: Path, nb: Any):
+        """Store a parsed notebook under the current state of its file"""
+        key = (str(notebook_path), notebook_path.stat().st_mtime_ns)
+        self._nb_parse_cache[key] = nb
+        self._trim_notebook_cache()
+    
+    def _trim_notebook_cache(self):
+        """Drop the oldest parsed notebooks beyond the cache size"""
+        while len(self._nb_parse_cache) > _NB_PARSE_CACHE_SIZE:
+            del self._nb_parse_cache[next(iter(self._nb_parse_cache))]
+    
+    def _get_kernel(self, cwd: Path) -> tuple:
+        """Get the shared kernel manager and client, resetting a reused kernel or starting one"""
+        if self._kernel_manager is not None and self._kernel_manager.is_alive() and self._reset_kernel(cwd):
+            return self._kernel_manager, self._kernel_client
+        
+        self.close()
+        kernel_manager = KernelManager(kernel_name='python3')
+        kernel_manager.start_kernel(cwd=str(cwd))
+        kernel_client = kernel_manager.client()
+        kernel_client.start_channels()
+        try:
+            kernel_client.wait_for_ready(timeout=60)
+        except Exception:
+            kernel_client.stop_channels()
+            kernel_manager.shutdown_kernel(now=True)
+            raise
+        kernel_client.allow_stdin = False
+        self._kernel_manager, self._kernel_client = kernel_manager, kernel_client
+        return self._kernel_manager, self._kernel_client
+    
+    def _reset_kernel(self, cwd: Path) -> bool:
+        """
+        Clear the shared kernel's namespace so one report cannot see another's variables
+        Args:
+            cwd: directory of the next notebook
+        Returns:
+            True if the kernel is ready for the next notebook
+        """
+        # %reset -f drops user variables but not imported modules, which is what keeps reuse cheap
+        code = f"%reset -f\n__import__('os').chdir({str(cwd)!r})"
+        try:
+            reply = self._kernel_client.execute_interactive(
+                code, store_history=False, allow_stdin=False, timeout=60, output_hook=lambda msg: None
+            )
+        except Exception as e:
+            ErrorHandler.log_warning(f"Error resetting notebook kernel: {str(e)}")
+            return False
+        return reply['content']['status'] == 'ok'
+    
+    def close(self):
+        """Shut down the shared notebook kernel and its client"""
+        if self._kernel_client is not None:
+            try:
+                self._kernel_client.stop_channels()
+            except Exception as e:
+                ErrorHandler.log_warning(f"Error stopping notebook kernel client: {str(e)}")
+            self._kernel_client = None
+        if self._kernel_manager is not None:
+            try:
+                if self._kernel_manager.has_kernel:
+                    self._kernel_manager.shutdown_kernel(now=True)
+            except Exception as e:
+                ErrorHandler.log_warning(f"Error shutting down notebook kernel: {str(e)}")
+            self._kernel_manager = None
+    
+    def __del__(self):
+        """Cleanup on destruction"""
+        try:
+            self.close()
+        except:
+            pass
+    
+    def _get_exporter(self, output_format: str) -> Any:
+        """Get the nbconvert exporter for a format, creating it on first use"""
+        exporter = self._exporters.get(output_format)
+        if exporter is None:
+            exporter = self._exporters[output_format] = self._exporter_factories[output_format]()
+        return exporter
+    
+    def _convert_notebook(self, notebook_path: Path, output_format: str, report_name: str) -> Path:
         """Convert notebook to specified format"""
-        if output_format not in self.exporters:
+        if output_format not in self._exporter_factories:
             raise ExecutionError(f"Unsupported output format: {output_format}")
         
         try:
-            # Read notebook
-            with open(notebook_path, 'r', encoding='utf-8') as f:
-                nb = nbformat.read(f, as_version=4)
+            # Read notebook (exporters copy the node before modifying it)
+            nb = self._read_notebook(notebook_path, mutable=False)
             
             # Convert notebook
-            exporter = self.exporters[output_format]
+            exporter = self._get_exporter(output_format)
             (body, resources) = exporter.from_notebook_node(nb)
             
             # Determine output extension
@@ -311,16 +969,14 @@ This report was generated for strategy **{strategy_name}** with the following ke
             }
             
             # Save converted report
-            output_path = self.reports_dir / f"{base_name}_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extensions[output_format]}"
+            output_path = self.reports_dir / f"{report_name}{extensions[output_format]}"
             
             if output_format == 'pdf':
                 # For PDF, write binary
-                with open(output_path, 'wb') as f:
-                    f.write(body)
+                output_path.write_bytes(body)
             else:
                 # For HTML and Markdown, write text
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(body)
+                output_path.write_text(body, encoding='utf-8')
             
             return output_path
             
@@ -330,22 +986,26 @@ This report was generated for strategy **{strategy_name}** with the following ke
     
     def get_available_formats(self) -> List[str]:
         """Get list of available output formats"""
-        formats = ['json', 'html', 'markdown']
-        if HAS_NBCONVERT:
-            formats.extend(list(self.exporters.keys()))
-        return list(set(formats))  # Remove duplicates
+        # dict keys de-duplicate while keeping a stable order for UI dropdowns
+        formats = dict.fromkeys(['json', 'html', 'markdown'])
+        formats.update(dict.fromkeys(self._exporter_factories))
+        return list(formats)
     
     def get_generated_reports(self) -> List[Dict[str, Any]]:
         """Get list of generated reports"""
         reports = []
-        for report_file in self.reports_dir.glob("*"):
-            if report_file.is_file():
+        with os.scandir(self.reports_dir) as entries:
+            for entry in entries:
+                if not entry.is_file() or entry.name.startswith('.'):
+                    continue
+                stat = entry.stat()
+                suffix = os.path.splitext(entry.name)[1]
                 reports.append({
-                    'name': report_file.name,
-                    'path': str(report_file),
-                    'size': report_file.stat().st_size,
-                    'created': datetime.fromtimestamp(report_file.stat().st_ctime),
-                    'format': report_file.suffix[1:] if report_file.suffix else 'unknown'
+                    'name': entry.name,
+                    'path': entry.path,
+                    'size': stat.st_size,
+                    'created': datetime.fromtimestamp(stat.st_ctime),
+                    'format': suffix[1:] if suffix else 'unknown'
                 })
         
         # Sort by creation time (newest first)
@@ -354,15 +1014,29 @@ This report was generated for strategy **{strategy_name}** with the following ke
     
     def delete_report(self, report_name: str) -> bool:
         """Delete a generated report"""
-        report_path = self.reports_dir / report_name
         try:
-            if report_path.exists():
-                report_path.unlink()
-                ErrorHandler.log_info(f"Deleted report: {report_name}")
-                return True
-            else:
-                ErrorHandler.log_warning(f"Report not found: {report_name}")
-                return False
+            os.unlink(self.reports_dir / report_name)
+            ErrorHandler.log_info(f"Deleted report: {report_name}")
+            return True
+        except FileNotFoundError:
+            ErrorHandler.log_warning(f"Report not found: {report_name}")
+            return False
         except Exception as e:
             ErrorHandler.log_error(f"Error deleting report: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+
+# Report generator owned by a worker process, created on its first task
+_worker_generator = None
+
+def _generate_one(result: BacktestResult, output_format: str, include_trades: bool) -> tuple:
+    """
+    Generate a single report inside a worker process
+    Returns:
+        report path (None on failure) and the cache index entries it added
+    """
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = ReportGenerator(persist_cache_index=False)
+    report_path = _worker_generator.generate_strategy_report(result, output_format, include_trades)
+    index_entries, _worker_generator._pending_index_entries = _worker_generator._pending_index_entries, []
+    return report_path, index_entries
@@ -1,59 +1,156 @@
 """
 Jupyter template management system (simplified version)
 """
+import os
 import json
-import shutil
+import math
+import numbers
+import re
+import time
+import importlib.util
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set
 from datetime import datetime
+from functools import lru_cache, cached_property
+
+# nbformat is only imported by the methods that build or read notebooks; it is by
+# far the slowest import here and listing templates does not need it
+HAS_NBFORMAT = importlib.util.find_spec('nbformat') is not None
 
 try:
-    import nbformat
-    from nbformat.v4 import new_notebook, new_code_cell, new_markdown_cell
-    HAS_NBFORMAT = True
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    HAS_NBFORMAT = False
+    HAS_ORJSON = False
 
 from utils.data_models import BacktestResult
 from utils.error_handling import ErrorHandler, error_handler, DataError
 
-class NotebookTemplate:
-    """Simple notebook template data class"""
-    def __init__(self, name: str, description: str, file_path: Path, 
-                 parameters: List[str] = None, template_type: str = "custom"):
-        self.name = name
-        self.description = description
-        self.file_path = file_path
-        self.parameters = parameters or []
-        self.template_type = template_type
+# {{name}} placeholders substituted by NotebookExecutor
+_PARAM_RE = re.compile(r'\{\{(\w+)\}\}')
+_DECLARED_PARAMS_PREFIX = '**Parameters:**'
+# Data loading cell replaced by _inject_data_into_notebook
+_INJECTION_TAG = 'injection-target'
+_INJECTION_MARKER = 'Parameters will be injected here'
+_MAX_TEMPLATE_READERS = 8
+_MIN_PARALLEL_TEMPLATES = 4  # smaller listings are read sequentially
+_TEMPLATE_INFO_CACHE_SIZE = 256
+_TEMPLATE_SOURCE_CACHE_SIZE = 32
+_TEMPLATE_INFO_TTL = 2.0  # seconds
+# Sidecar next to each template notebook holding its listing metadata
+_META_SUFFIX = '.meta.json'
 
-class JupyterTemplateManager:
-    """Jupyter template management system"""
+# Layout of dict/list literals in the injected data cell
+_LITERAL_LINE_WIDTH = 100
+_LITERAL_INDENT = 4
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available"""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(data: Any, indent: bool = True) -> bytes:
+    """
+    Serialize data to UTF-8 JSON, using orjson when available
+    Args:
+        data: data to serialize
+        indent: pretty-print with 2-space indentation; compact output otherwise
+    Returns:
+        encoded JSON
+    """
+    if HAS_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def _python_literal(value: Any, indent: Optional[int] = 0) -> str:
+    """
+    Format a value as readable Python source for the injected data cell
+    Args:
+        value: injected value; dicts, lists and tuples are emitted as dict/list displays
+        indent: indentation of the line the literal starts on, or None to keep it on one line
+    Returns:
+        expression evaluating to the value, with None/True/False rather than JSON null/true/false
+    """
+    # Exact builtin types first; the isinstance checks below only see subclasses and NumPy scalars
+    value_type = type(value)
+    if value_type is str:
+        return repr(value)
+    if value is None or value_type is bool or value_type is int:
+        return repr(value)
+    if value_type is float:
+        return _float_literal(value)
+    if value_type is dict or value_type is list:
+        return _container_literal(value, indent)
     
-    def __init__(self, templates_dir: str = "notebook_templates"):
-        """
-        Initialize template manager
-        Args:
-            templates_dir: directory for storing templates
-        """
-        self.templates_dir = Path(templates_dir)
-        self.templates_dir.mkdir(exist_ok=True)
-        self.outputs_dir = Path("notebook_outputs")
-        self.outputs_dir.mkdir(exist_ok=True)
-        
-        # Initialize default templates if nbformat is available
-        if HAS_NBFORMAT:
-            self._create_default_templates()
-        else:
-            self._create_simple_templates()
+    if isinstance(value, str):
+        return repr(str(value))
+    if isinstance(value, numbers.Integral):
+        return repr(int(value))
+    if isinstance(value, numbers.Real):
+        return _float_literal(float(value))
+    if isinstance(value, (dict, list, tuple)):
+        return _container_literal(value, indent)
+    return repr(str(value))
+
+def _float_literal(value: float) -> str:
+    """Format a float as Python source, spelling out nan and inf"""
+    return repr(value) if math.isfinite(value) else f"float('{value}')"
+
+def _container_literal(value, indent: Optional[int]) -> str:
+    """Format a dict or list display, one item per line when it does not fit on one"""
+    if isinstance(value, dict):
+        brackets = '{}'
+        # JSON-style string keys, as the data was serialized before
+        items = [(f"{_python_literal(key if isinstance(key, str) else str(key))}: ", item)
+                 for key, item in value.items()]
+    else:
+        brackets = '[]'
+        items = [('', item) for item in value]
+    if not items:
+        return brackets
     
-    def _create_simple_templates(self):
-        """Create simple text-based templates when nbformat is not available"""
-        templates = [
-            {
-                "name": "strategy_analysis",
-                "description": "Strategy analysis template",
-                "content": """# Strategy Analysis Template
+    # Each item takes at least three characters inline, so long containers skip the one-line attempt
+    if indent is not None and len(items) * 3 > _LITERAL_LINE_WIDTH:
+        return _multiline_literal(items, brackets, indent)
+    flat = brackets[0] + ', '.join(prefix + _python_literal(item, None) for prefix, item in items) + brackets[1]
+    if indent is None or indent + len(flat) <= _LITERAL_LINE_WIDTH:
+        return flat
+    return _multiline_literal(items, brackets, indent)
+
+def _multiline_literal(items: List[tuple], brackets: str, indent: int) -> str:
+    """Format (prefix, item) pairs as a display with one item per line"""
+    inner = indent + _LITERAL_INDENT
+    lines = [f"{' ' * inner}{prefix}{_python_literal(item, inner)}," for prefix, item in items]
+    return '\n'.join([brackets[0], *lines, ' ' * indent + brackets[1]])
+
+def _template_suffixes(suffix: Optional[str]) -> tuple:
+    """Get the template file suffixes to try, .ipynb first unless one is given"""
+    if suffix is None:
+        return ('.ipynb', '.md')
+    return (suffix,)
+
+def _write_notebook(path: Path, nb: Any):
+    """Write a notebook as compact JSON without building it twice in memory"""
+    if HAS_ORJSON:
+        path.write_bytes(orjson.dumps(nb, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
+        return
+    
+    # json.dump streams encoder chunks into the file instead of one str + encoded copy
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(nb, f, separators=(',', ':'), ensure_ascii=False)
+
+# Built-in template specs, created on first use when missing from templates_dir
+_SIMPLE_TEMPLATES = (
+    {
+        "name": "strategy_analysis",
+        "description": "Strategy analysis template",
+        "content": """# Strategy Analysis Template
 
 ## Import Libraries
 ```python
@@ -73,11 +170,11 @@ import seaborn as sns
 # Add your analysis code here
 ```
 """
-            },
-            {
-                "name": "performance_comparison", 
-                "description": "Performance comparison template",
-                "content": """# Performance Comparison Template
+    },
+    {
+        "name": "performance_comparison", 
+        "description": "Performance comparison template",
+        "content": """# Performance Comparison Template
 
 ## Import Libraries
 ```python
@@ -96,49 +193,171 @@ import plotly.graph_objects as go
 # Add comparison code here
 ```
 """
-            }
-        ]
-        
-        for template_info in templates:
-            template_path = self.templates_dir / f"{template_info['name']}.md"
-            if not template_path.exists():
-                with open(template_path, 'w', encoding='utf-8') as f:
-                    f.write(template_info['content'])
+    }
+)
+
+_DEFAULT_TEMPLATES = (
+    {
+        "name": "strategy_analysis",
+        "description": "Comprehensive strategy analysis template",
+        "template_type": "analysis",
+        "parameters": ["strategy_name", "results_data", "config_data"]
+    },
+    {
+        "name": "performance_comparison",
+        "description": "Multi-strategy performance comparison template",
+        "template_type": "comparison", 
+        "parameters": ["strategies_data", "comparison_metrics"]
+    },
+    {
+        "name": "risk_analysis",
+        "description": "Risk analysis and drawdown analysis template",
+        "template_type": "risk",
+        "parameters": ["results_data", "risk_metrics"]
+    }
+)
+
+# Template-specific cells appended after the common header/imports/data cells
+_ANALYSIS_CELLS = {
+    "analysis": (
+        ("markdown", "## 📊 Performance Overview"),
+        ("code", """# Performance metrics overview
+def display_performance_metrics(results_data):
+    if not results_data:
+        print("No results data available")
+        return
+    
+    metrics = results_data.get('metrics', {})
+    print("Performance Metrics:")
+    print(f"Total Return: {metrics.get('total_return_pct', 0):.2f}%")
+    print(f"Win Rate: {metrics.get('win_rate', 0):.2f}%")
+    print(f"Max Drawdown: {metrics.get('max_drawdown_pct', 0):.2f}%")
+    print(f"Sharpe Ratio: {metrics.get('sharpe_ratio', 0):.3f}")
+    print(f"Total Trades: {metrics.get('total_trades', 0)}")
+
+# Display metrics (will be populated with actual data)
+print("Performance metrics will be displayed here")"""),
+    ),
+    "comparison": (
+        ("markdown", "## 🔄 Strategy Comparison Analysis"),
+        ("code", """# Multi-strategy comparison
+def compare_strategies(strategies_data):
+    if not strategies_data:
+        print("No strategies data available")
+        return
+    
+    print("Strategy Comparison:")
+    for strategy_name, data in strategies_data.items():
+        metrics = data.get('metrics', {})
+        print(f"\\n{strategy_name}:")
+        print(f"  Return: {metrics.get('total_return_pct', 0):.2f}%")
+        print(f"  Win Rate: {metrics.get('win_rate', 0):.2f}%")
+        print(f"  Drawdown: {metrics.get('max_drawdown_pct', 0):.2f}%")
+
+# Compare strategies (will be populated with actual data)
+print("Strategy comparison will be displayed here")"""),
+    ),
+    "risk": (
+        ("markdown", "## 📉 Risk Analysis"),
+        ("code", """# Risk analysis
+def analyze_risk(results_data):
+    if not results_data:
+        print("No results data available")
+        return
+    
+    metrics = results_data.get('metrics', {})
+    print("Risk Analysis:")
+    print(f"Max Drawdown: {metrics.get('max_drawdown_pct', 0):.2f}%")
+    print(f"Sharpe Ratio: {metrics.get('sharpe_ratio', 0):.3f}")
+    print(f"Volatility: {metrics.get('volatility', 0):.2f}%")
+
+# Analyze risk (will be populated with actual data)
+print("Risk analysis will be displayed here")"""),
+    ),
+}
+
+class NotebookTemplate:
+    """Simple notebook template data class"""
+    def __init__(self, name: str, description: str, file_path: Path, 
+                 parameters: List[str] = None, template_type: str = "custom"):
+        self.name = name
+        self.description = description
+        self.file_path = file_path
+        self.parameters = parameters or []
+        self.template_type = template_type
+    
+    @cached_property
+    def parameters_display(self) -> str:
+        """Comma-separated parameter names, computed once per (cached) template"""
+        return ', '.join(self.parameters)
+
+class JupyterTemplateManager:
+    """Jupyter template management system"""
+    
+    # Template directories whose built-in templates were already ensured in this process
+    _init_done: Set[Path] = set()
+    # Directories already created (or found) by a manager in this process
+    _ensured_dirs: Set[Path] = set()
+    
+    def __init__(self, templates_dir: str = "notebook_templates"):
+        """
+        Initialize template manager
+        Args:
+            templates_dir: directory for storing templates
+        """
+        self.templates_dir = Path(templates_dir)
+        self.outputs_dir = Path("notebook_outputs")
+        for directory in (self.templates_dir, self.outputs_dir):
+            # absolute() only joins with the cwd; resolve() would stat every component
+            directory_key = directory.absolute()
+            if directory_key not in JupyterTemplateManager._ensured_dirs:
+                directory.mkdir(exist_ok=True)
+                JupyterTemplateManager._ensured_dirs.add(directory_key)
+        
+        # (directory signature, templates) from the last listing
+        self._templates_cache: Optional[tuple] = None
+        # (path, mtime_ns, size) of template versions whose sidecar is up to date
+        self._meta_written: Set[tuple] = set()
+        # template name -> (monotonic time, info) from get_template_info
+        self._info_cache: Dict[tuple, tuple] = {}
+        
+        # Default templates are created on first use, see _ensure_default_templates
+        self._templates_key = self.templates_dir.absolute()
+    
+    def _ensure_default_templates(self):
+        """Create default templates (nbformat if available) the first time they are needed"""
+        if self._templates_key in JupyterTemplateManager._init_done:
+            return
+        
+        if HAS_NBFORMAT:
+            self._create_default_templates()
+        else:
+            self._create_simple_templates()
+        JupyterTemplateManager._init_done.add(self._templates_key)
+    
+    def _create_simple_templates(self):
+        """Create simple text-based templates when nbformat is not available"""
+        existing = set(os.listdir(self.templates_dir))
+        for template_info in _SIMPLE_TEMPLATES:
+            file_name = f"{template_info['name']}.md"
+            if file_name not in existing:
+                (self.templates_dir / file_name).write_text(template_info['content'], encoding='utf-8')
     
     def _create_default_templates(self):
         """Create default analysis templates using nbformat"""
-        templates = [
-            {
-                "name": "strategy_analysis",
-                "description": "Comprehensive strategy analysis template",
-                "template_type": "analysis",
-                "parameters": ["strategy_name", "results_data", "config_data"]
-            },
-            {
-                "name": "performance_comparison",
-                "description": "Multi-strategy performance comparison template",
-                "template_type": "comparison", 
-                "parameters": ["strategies_data", "comparison_metrics"]
-            },
-            {
-                "name": "risk_analysis",
-                "description": "Risk analysis and drawdown analysis template",
-                "template_type": "risk",
-                "parameters": ["results_data", "risk_metrics"]
-            }
-        ]
-        
-        for template_info in templates:
-            template_path = self.templates_dir / f"{template_info['name']}.ipynb"
-            if not template_path.exists():
-                self._create_template_notebook(template_info, template_path)
+        existing = set(os.listdir(self.templates_dir))
+        for template_info in _DEFAULT_TEMPLATES:
+            file_name = f"{template_info['name']}.ipynb"
+            if file_name not in existing:
+                self._create_template_notebook(template_info, self.templates_dir / file_name)
     
     def _create_template_notebook(self, template_info: Dict[str, Any], output_path: Path):
         """Create a template notebook"""
         if not HAS_NBFORMAT:
             ErrorHandler.log_warning("nbformat not available, cannot create notebook templates")
             return
-            
+        
+        from nbformat.v4 import new_notebook, new_code_cell, new_markdown_cell
         nb = new_notebook()
         
         # Add title cell
@@ -172,122 +391,154 @@ print("Libraries imported successfully!")""")
         data_cell = new_code_cell("""# Load data (this will be populated automatically)
 # Parameters will be injected here by the template system
 print("Data loading section - parameters will be injected automatically")""")
+        data_cell.metadata['tags'] = [_INJECTION_TAG]
         nb.cells.append(data_cell)
         
         # Add template-specific content
-        if template_info['template_type'] == 'analysis':
-            self._add_strategy_analysis_cells(nb)
-        elif template_info['template_type'] == 'comparison':
-            self._add_comparison_analysis_cells(nb)
-        elif template_info['template_type'] == 'risk':
-            self._add_risk_analysis_cells(nb)
+        cell_factories = {'markdown': new_markdown_cell, 'code': new_code_cell}
+        for cell_type, source in _ANALYSIS_CELLS.get(template_info['template_type'], ()):
+            nb.cells.append(cell_factories[cell_type](source))
         
         # Save notebook
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                nbformat.write(nb, f)
+            _write_notebook(output_path, nb)
             ErrorHandler.log_info(f"Created template notebook: {output_path}")
         except Exception as e:
             ErrorHandler.log_error(f"Error creating template notebook: {str(e)}")
     
-    def _add_strategy_analysis_cells(self, nb):
-        """Add strategy analysis specific cells"""
-        if not HAS_NBFORMAT:
-            return
-            
-        # Performance overview
-        overview_cell = new_markdown_cell("## 📊 Performance Overview")
-        nb.cells.append(overview_cell)
+    @error_handler(Exception, show_error=True)
+    def get_available_templates(self) -> List[NotebookTemplate]:
+        """Get list of available templates"""
+        self._ensure_default_templates()
         
-        overview_code = new_code_cell("""# Performance metrics overview
-def display_performance_metrics(results_data):
-    if not results_data:
-        print("No results data available")
-        return
-    
-    metrics = results_data.get('metrics', {})
-    print("Performance Metrics:")
-    print(f"Total Return: {metrics.get('total_return_pct', 0):.2f}%")
-    print(f"Win Rate: {metrics.get('win_rate', 0):.2f}%")
-    print(f"Max Drawdown: {metrics.get('max_drawdown_pct', 0):.2f}%")
-    print(f"Sharpe Ratio: {metrics.get('sharpe_ratio', 0):.3f}")
-    print(f"Total Trades: {metrics.get('total_trades', 0)}")
-
-# Display metrics (will be populated with actual data)
-print("Performance metrics will be displayed here")""")
-        nb.cells.append(overview_code)
-    
-    def _add_comparison_analysis_cells(self, nb):
-        """Add comparison analysis specific cells"""
-        if not HAS_NBFORMAT:
-            return
-            
-        comparison_cell = new_markdown_cell("## 🔄 Strategy Comparison Analysis")
-        nb.cells.append(comparison_cell)
+        # Look for both .ipynb and .md files; DirEntry.stat() reuses the directory read
+        with os.scandir(self.templates_dir) as it:
+            entries = [
+                e for e in it
+                if e.name.endswith(('.ipynb', '.md')) and not e.name.startswith('.') and e.is_file()
+            ]
         
-        comparison_code = new_code_cell("""# Multi-strategy comparison
-def compare_strategies(strategies_data):
-    if not strategies_data:
-        print("No strategies data available")
-        return
-    
-    print("Strategy Comparison:")
-    for strategy_name, data in strategies_data.items():
-        metrics = data.get('metrics', {})
-        print(f"\\n{strategy_name}:")
-        print(f"  Return: {metrics.get('total_return_pct', 0):.2f}%")
-        print(f"  Win Rate: {metrics.get('win_rate', 0):.2f}%")
-        print(f"  Drawdown: {metrics.get('max_drawdown_pct', 0):.2f}%")
-
-# Compare strategies (will be populated with actual data)
-print("Strategy comparison will be displayed here")""")
-        nb.cells.append(comparison_code)
-    
-    def _add_risk_analysis_cells(self, nb):
-        """Add risk analysis specific cells"""
-        if not HAS_NBFORMAT:
-            return
-            
-        risk_cell = new_markdown_cell("## 📉 Risk Analysis")
-        nb.cells.append(risk_cell)
+        # File names catch adds/removes/renames, mtimes and sizes catch edits. The directory
+        # mtime is left out: writing a sidecar would change it on every listing
+        signature = tuple(sorted((e.name, e.stat().st_mtime_ns, e.stat().st_size) for e in entries))
+        if self._templates_cache is not None and self._templates_cache[0] == signature:
+            return list(self._templates_cache[1])
         
-        risk_code = new_code_cell("""# Risk analysis
-def analyze_risk(results_data):
-    if not results_data:
-        print("No results data available")
-        return
+        # File reads and JSON parsing overlap well across threads, but below a few files
+        # starting the pool costs more than reading them in turn
+        if len(entries) >= _MIN_PARALLEL_TEMPLATES:
+            workers = min(_MAX_TEMPLATE_READERS, len(entries))
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                extracted = list(executor.map(self._load_template_info, entries))
+        else:
+            extracted = [self._load_template_info(e) for e in entries]
+        templates = [result[0] for result in extracted if result is not None]
+        
+        # Sidecars are written here on the calling thread, not from the cached parser,
+        # which runs on reader threads and only on cache misses
+        for entry, result in zip(entries, extracted):
+            if result is not None and result[1]:
+                self._write_template_meta(entry, result[0])
+        
+        self._templates_cache = (signature, templates)
+        return list(templates)
     
-    metrics = results_data.get('metrics', {})
-    print("Risk Analysis:")
-    print(f"Max Drawdown: {metrics.get('max_drawdown_pct', 0):.2f}%")
-    print(f"Sharpe Ratio: {metrics.get('sharpe_ratio', 0):.3f}")
-    print(f"Volatility: {metrics.get('volatility', 0):.2f}%")
-
-# Analyze risk (will be populated with actual data)
-print("Risk analysis will be displayed here")""")
-        nb.cells.append(risk_code)
+    def _load_template_info(self, entry: os.DirEntry) -> Optional[tuple]:
+        """Extract (template, parsed) info, logging and skipping unreadable templates"""
+        try:
+            stat = entry.stat()
+            return self._extract_template_info(entry.path, stat.st_mtime_ns, stat.st_size)
+        except Exception as e:
+            ErrorHandler.log_warning(f"Error reading template {entry.path}: {str(e)}")
+            return None
     
-    @error_handler(Exception, show_error=True)
-    def get_available_templates(self) -> List[NotebookTemplate]:
-        """Get list of available templates"""
-        templates = []
-        
-        # Look for both .ipynb and .md files
-        for template_file in self.templates_dir.glob("*"):
-            if template_file.suffix in ['.ipynb', '.md']:
-                try:
-                    template = NotebookTemplate(
+    @staticmethod
+    @lru_cache(maxsize=_TEMPLATE_INFO_CACHE_SIZE)
+    def _extract_template_info(path: str, mtime_ns: int, size: int) -> tuple:
+        """
+        Build template info from a template file in a single pass
+        Args:
+            path: .ipynb or .md template path
+            mtime_ns: file modification time, part of the cache key
+            size: file size, part of the cache key
+        Returns:
+            (template, parsed): parsed is True when a notebook was read instead of its sidecar
+        """
+        template_file = Path(path)
+        meta_path = template_file.with_name(template_file.name + _META_SUFFIX)
+        if template_file.suffix == '.ipynb':
+            # Sidecar is only trusted while it describes this exact file version
+            try:
+                meta = _json_loads(meta_path.read_bytes())
+                if meta['mtime_ns'] == mtime_ns and meta['size'] == size:
+                    return NotebookTemplate(
                         name=template_file.stem,
-                        description=f"Template: {template_file.stem}",
+                        description=meta['description'],
                         file_path=template_file,
-                        parameters=[],
-                        template_type="custom"
-                    )
-                    templates.append(template)
-                except Exception as e:
-                    ErrorHandler.log_warning(f"Error reading template {template_file}: {str(e)}")
-        
-        return templates
+                        parameters=meta['parameters'],
+                        template_type=meta.get('template_type', 'custom')
+                    ), False
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+        
+        header = None
+        if template_file.suffix == '.ipynb':
+            code_sources = []
+            for cell in _json_loads(template_file.read_bytes()).get('cells', []):
+                cell_type = cell.get('cell_type')
+                if cell_type == 'code' or (cell_type == 'markdown' and header is None):
+                    source = cell.get('source', '')
+                    if isinstance(source, list):
+                        source = ''.join(source)
+                    if cell_type == 'code':
+                        code_sources.append(source)
+                    else:
+                        header = source
+            body = '\n'.join(code_sources)
+        else:
+            header = body = template_file.read_text(encoding='utf-8')
+        
+        title = None
+        parameters = []
+        for line in (header or '').splitlines():
+            line = line.strip()
+            if line.startswith(_DECLARED_PARAMS_PREFIX):
+                declared = line[len(_DECLARED_PARAMS_PREFIX):].split(',')
+                parameters.extend(p.strip() for p in declared if p.strip())
+            elif line.startswith('#') and not title:
+                title = line.lstrip('#').strip()[:200]
+        
+        parameters.extend(_PARAM_RE.findall(body))
+        
+        template = NotebookTemplate(
+            name=template_file.stem,
+            description=title or f"Template: {template_file.stem}",
+            file_path=template_file,
+            parameters=list(dict.fromkeys(parameters)),
+            template_type="custom"
+        )
+        return template, template_file.suffix == '.ipynb'
+    
+    def _write_template_meta(self, entry: os.DirEntry, template: NotebookTemplate):
+        """Write the listing metadata sidecar for a parsed template notebook, once per file version"""
+        stat = entry.stat()
+        key = (entry.path, stat.st_mtime_ns, stat.st_size)
+        if key in self._meta_written:
+            return
+        
+        meta_path = Path(entry.path + _META_SUFFIX)
+        try:
+            meta_path.write_bytes(_json_dumps({
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'description': template.description,
+                'parameters': template.parameters,
+                'template_type': template.template_type
+            }, indent=False))
+            self._meta_written.add(key)
+        except OSError as e:
+            ErrorHandler.log_warning(f"Could not write template metadata {meta_path}: {str(e)}")
     
     @error_handler(Exception, show_error=True)
     def create_analysis_notebook(self, 
@@ -303,6 +554,7 @@ print("Risk analysis will be displayed here")""")
         Returns:
             path to created notebook
         """
+        self._ensure_default_templates()
         template_path = self.templates_dir / f"{template_name}.ipynb"
         
         # Try .md template if .ipynb doesn't exist
@@ -317,98 +569,165 @@ print("Risk analysis will be displayed here")""")
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_name = f"{template_name}_{timestamp}"
         
-        if template_path.suffix == '.ipynb' and HAS_NBFORMAT:
+        stat = template_path.stat()
+        as_notebook = template_path.suffix == '.ipynb' and HAS_NBFORMAT
+        template_source = self._read_template_source(
+            str(template_path), stat.st_mtime_ns, stat.st_size, as_notebook
+        )
+        
+        if as_notebook:
             output_path = self.outputs_dir / f"{output_name}.ipynb"
             
-            # Read template
-            with open(template_path, 'r', encoding='utf-8') as f:
-                nb = nbformat.read(f, as_version=4)
+            # Copy the cached template; from_dict rebuilds every container
+            from nbformat import from_dict
+            nb = from_dict(template_source)
             
             # Inject data into notebook
             self._inject_data_into_notebook(nb, data)
             
             # Save output notebook
-            with open(output_path, 'w', encoding='utf-8') as f:
-                nbformat.write(nb, f)
+            _write_notebook(output_path, nb)
         else:
             # Create simple text output
             output_path = self.outputs_dir / f"{output_name}.md"
             
-            with open(template_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Simple data injection for markdown
-            content += f"\\n\\n## Data\\n```json\\n{json.dumps(data, indent=2)}\\n```"
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Simple data injection for markdown, appended without decoding the template
+            data_section = b"\\n\\n## Data\\n```json\\n" + _json_dumps(data) + b"\\n```"
+            output_path.write_bytes(template_source + data_section)
         
         ErrorHandler.log_info(f"Created analysis notebook: {output_path}")
         return output_path
     
+    @staticmethod
+    @lru_cache(maxsize=_TEMPLATE_SOURCE_CACHE_SIZE)
+    def _read_template_source(path: str, mtime_ns: int, size: int, as_notebook: bool) -> Any:
+        """
+        Read a template once per file version
+        Args:
+            path: template path
+            mtime_ns: file modification time, part of the cache key
+            size: file size, part of the cache key
+            as_notebook: parse into a NotebookNode instead of returning raw bytes
+        Returns:
+            shared NotebookNode (copy before mutating) or raw template bytes
+        """
+        raw = Path(path).read_bytes()
+        if not as_notebook:
+            return raw
+        
+        from nbformat.v4 import to_notebook_json
+        return to_notebook_json(_json_loads(raw))
+    
     def _inject_data_into_notebook(self, nb, data: Dict[str, Any]):
         """Inject data into notebook cells"""
         if not HAS_NBFORMAT:
             return
             
-        # Find data loading cell and inject parameters
-        for cell in nb.cells:
-            if cell.cell_type == 'code' and 'Parameters will be injected here' in cell.source:
-                # Create data injection code
-                injection_code = "# Data injected by template system\\n"
-                for key, value in data.items():
-                    if isinstance(value, str):
-                        injection_code += f"{key} = '{value}'\\n"
-                    elif isinstance(value, dict):
-                        injection_code += f"{key} = {json.dumps(value, indent=2)}\\n"
-                    elif isinstance(value, list):
-                        injection_code += f"{key} = {json.dumps(value, indent=2)}\\n"
-                    else:
-                        injection_code += f"{key} = {value}\\n"
-                
-                injection_code += "\\nprint('Data injected successfully!')\\n"
-                injection_code += "print(f'Available parameters: {list(locals().keys())}')"
-                
-                # Replace cell content
-                cell.source = injection_code
-                break
+        # Find data loading cell: tagged at creation, marker text for older templates
+        target = next((c for c in nb.cells if _INJECTION_TAG in c.metadata.get('tags', ())), None)
+        if target is None:
+            target = next(
+                (c for c in nb.cells if c.cell_type == 'code' and _INJECTION_MARKER in c.source),
+                None
+            )
+        if target is None:
+            return
+        
+        # Create data injection code
+        parts = ["# Data injected by template system"]
+        for key, value in data.items():
+            parts.append(f"{key} = {_python_literal(value)}")
+        
+        parts.append("")
+        parts.append("print('Data injected successfully!')")
+        parts.append("print(f'Available parameters: {list(locals().keys())}')")
+        
+        # Replace cell content
+        target.source = "\n".join(parts)
     
-    def get_template_info(self, template_name: str) -> Optional[Dict[str, Any]]:
-        """Get detailed template information"""
-        template_path = self.templates_dir / f"{template_name}.ipynb"
+    def get_template_info(self, template_name: str, suffix: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get detailed template information
+        Args:
+            template_name: template name without extension
+            suffix: '.ipynb' or '.md' to pick one file when both exist (default: prefer .ipynb)
+        Returns:
+            template information or None if not found
+        """
+        self._ensure_default_templates()
         
-        # Try .md template if .ipynb doesn't exist
-        if not template_path.exists():
-            template_path = self.templates_dir / f"{template_name}.md"
+        # UI reruns poll this repeatedly; serve recent results without touching disk
+        cache_key = (template_name, suffix)
+        cached = self._info_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < _TEMPLATE_INFO_TTL:
+            return dict(cached[1])
         
-        if not template_path.exists():
+        # Try .md template if .ipynb doesn't exist; one stat per candidate
+        for suffix in _template_suffixes(suffix):
+            template_path = self.templates_dir / f"{template_name}{suffix}"
+            try:
+                stat = template_path.stat()
+                break
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                ErrorHandler.log_error(f"Error reading template info: {str(e)}")
+                return None
+        else:
             return None
         
-        try:
-            return {
-                'name': template_name,
-                'path': str(template_path),
-                'created': datetime.fromtimestamp(template_path.stat().st_ctime),
-                'modified': datetime.fromtimestamp(template_path.stat().st_mtime),
-                'size': template_path.stat().st_size,
-                'type': template_path.suffix
-            }
-        except Exception as e:
-            ErrorHandler.log_error(f"Error reading template info: {str(e)}")
-            return None
+        info = {
+            'name': template_name,
+            'path': str(template_path),
+            'created': datetime.fromtimestamp(stat.st_ctime),
+            'modified': datetime.fromtimestamp(stat.st_mtime),
+            'size': stat.st_size,
+            'type': template_path.suffix
+        }
+        self._info_cache[cache_key] = (time.monotonic(), info)
+        return dict(info)
     
-    def delete_template(self, template_name: str) -> bool:
-        """Delete a template"""
-        for suffix in ['.ipynb', '.md']:
+    def delete_template(self, template_name: str, suffix: Optional[str] = None) -> bool:
+        """
+        Delete a template
+        Args:
+            template_name: template name without extension
+            suffix: '.ipynb' or '.md' to pick one file when both exist (default: prefer .ipynb)
+        Returns:
+            True if a template file was deleted
+        """
+        self._ensure_default_templates()
+        # Unlink directly; a missing file costs one failed syscall instead of exists() + unlink()
+        for suffix in _template_suffixes(suffix):
             template_path = self.templates_dir / f"{template_name}{suffix}"
-            if template_path.exists():
-                try:
-                    template_path.unlink()
-                    ErrorHandler.log_info(f"Deleted template: {template_name}")
-                    return True
-                except Exception as e:
-                    ErrorHandler.log_error(f"Error deleting template: {str(e)}")
-                    return False
+            try:
+                os.unlink(template_path)
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                ErrorHandler.log_error(f"Error deleting template: {str(e)}")
+                return False
+            
+            template_path.with_name(template_path.name + _META_SUFFIX).unlink(missing_ok=True)
+            self._info_cache.pop((template_name, suffix), None)
+            self._info_cache.pop((template_name, None), None)
+            ErrorHandler.log_info(f"Deleted template: {template_path.name}")
+            return True
         
         ErrorHandler.log_warning(f"Template not found: {template_name}")
-        return False
\ No newline at end of file
+        return False
+
+_template_managers: Dict[str, JupyterTemplateManager] = {}
+
+def get_template_manager(templates_dir: str = "notebook_templates") -> JupyterTemplateManager:
+    """
+    Get the process-wide template manager for a templates directory
+    Args:
+        templates_dir: directory for storing templates
+    Returns:
+        shared manager, reused across Streamlit reruns
+    """
+    manager = _template_managers.get(templates_dir)
+    if manager is None:
+        manager = _template_managers[templates_dir] = JupyterTemplateManager(templates_dir)
+    return manager
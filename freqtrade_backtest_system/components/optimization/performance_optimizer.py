@@ -2,24 +2,381 @@
 System performance optimization components
 """
 import gc
+import hashlib
+import math
+import os
+import sys
+import tempfile
+import weakref
 import psutil
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import sched
+import warnings
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, List, Any, Optional, Callable
+from collections import OrderedDict, Counter
+from itertools import chain
+from functools import lru_cache
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import pickle
 import gzip
+import io
 import json
 from pathlib import Path
+import numpy as np
 
-from utils.error_handling import ErrorHandler, error_handler
+from utils.error_handling import ErrorHandler, error_handler, DataError
 from utils.data_models import BacktestResult
 
-@dataclass
+# Log functions bound once and used module-wide, so hot paths skip the attribute lookup
+_log_info = ErrorHandler.log_info
+_log_warning = ErrorHandler.log_warning
+_log_error = ErrorHandler.log_error
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import pyarrow as pa
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    import cloudpickle
+    HAS_CLOUDPICKLE = True
+except ImportError:
+    HAS_CLOUDPICKLE = False
+
+# How long a psutil.virtual_memory() snapshot is reused, in seconds
+_VM_CACHE_TTL = 0.25
+# Bytes to MB factor
+_MB = 1.0 / (1024 * 1024)
+
+# Ring buffer layout for profiler samples, in PerformanceMetrics field order.
+# Capacity covers the longest history window the panel offers at the default sampling interval
+_METRICS_HISTORY_HOURS = 48
+_DEFAULT_MONITOR_INTERVAL = 5
+_METRICS_CAPACITY = _METRICS_HISTORY_HOURS * 3600 // _DEFAULT_MONITOR_INTERVAL
+# Samples returned by the deprecated metrics_history property, its size before the ring buffer
+_LEGACY_HISTORY_SIZE = 1000
+_METRIC_COLUMNS = (
+    ('cpu_usage', np.float64),
+    ('memory_usage', np.float64),
+    ('memory_available', np.float64),
+    ('disk_usage', np.float64),
+    ('active_threads', np.int64),
+    ('cache_hit_rate', np.float64),
+    ('execution_time', np.float64),
+    ('timestamp', 'datetime64[us]'),  # Naive local time, like datetime.now()
+)
+
+_CACHE_SUFFIX = '.cache'
+# Temporary files from _write_cache_bytes; ones older than this were left by a crashed writer
+_TEMP_SUFFIX = '.tmp'
+_STALE_TEMP_SECONDS = 3600.0
+_DEFAULT_CACHE_TTL_HOURS = 24
+# Minimum seconds between automatic cleanups triggered by set()
+_CACHE_CLEANUP_INTERVAL = 60.0
+# Share of max_cache_size that the in-memory tier may hold
+_MEMORY_CACHE_FRACTION = 4
+
+# Raised generation-0 threshold: the CPython default of 700 allocations
+# triggers young collections constantly during allocation-heavy backtests.
+# Process-wide, so it is applied only in pool workers and on request
+_GC_THRESHOLDS = (50000, 10, 10)
+_gc_thresholds_set = False
+
+# In-memory caches that MemoryOptimizer drops under memory pressure
+_REGISTERED_CACHES = weakref.WeakSet()
+
+# One timer thread drives every PerformanceProfiler; it exits when no ticks are queued
+_monitor_wakeup = threading.Event()
+_monitor_lock = threading.Lock()
+_monitor_thread = None
+
+# Average per-task time below which thread batches are dispatched in chunks
+_CHEAP_TASK_SECONDS = 0.005
+
+# Process pool shared by all ConcurrencyOptimizer instances for CPU-bound batches
+_process_pool = None
+_process_pool_workers = 0
+_process_pool_lock = threading.Lock()
+
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+_ARROW_MAGIC = b'ARROW1'
+# Pickle protocol 2+ streams start with the PROTO opcode, so raw pickles need no flag byte
+_PICKLE_MAGIC = b'\x80'
+# Payloads below this size, or whose sample looks already compressed, are stored raw
+_MIN_COMPRESS_SIZE = 1024
+_ENTROPY_SAMPLE_SIZE = 4096
+_MAX_COMPRESSIBLE_ENTROPY = 7.5  # bits per byte
+_ZSTD_LEVEL = 3
+
+def _compress(data: bytes) -> bytes:
+    """Compress bytes with zstd when available, gzip otherwise"""
+    if HAS_ZSTD:
+        return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=1)
+
+def _is_compressible(data: bytes) -> bool:
+    """Check whether data is large enough and low-entropy enough to be worth compressing"""
+    if len(data) < _MIN_COMPRESS_SIZE:
+        return False
+    
+    sample = data[:_ENTROPY_SAMPLE_SIZE]
+    size = len(sample)
+    entropy = -sum(count / size * math.log2(count / size) for count in Counter(sample).values())
+    return entropy <= _MAX_COMPRESSIBLE_ENTROPY
+
+def _decompress(data: bytes) -> bytes:
+    """Decompress zstd or gzip bytes, detected from the frame header"""
+    if data[:4] == _ZSTD_MAGIC:
+        if not HAS_ZSTD:
+            raise ValueError("zstd-compressed data requires the zstandard package")
+        # decompressobj handles streamed frames that carry no content size
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return gzip.decompress(data)
+
+def _open_compressor(buffer: io.BytesIO):
+    """Open a streaming compressor (zstd or gzip) writing into a buffer"""
+    if HAS_ZSTD:
+        return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).stream_writer(buffer, closefd=False)
+    return gzip.GzipFile(fileobj=buffer, mode='wb')
+
+def _dumps_json_bytes(data: Any) -> bytes:
+    """Serialize data to compact UTF-8 JSON, using orjson when available"""
+    if HAS_ORJSON:
+        return orjson.dumps(data, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=str).encode('utf-8')
+
+def _loads_json(data: bytes) -> Any:
+    """Deserialize UTF-8 JSON bytes"""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+def _write_cache_bytes(cache_file: Path, payload, durable: bool = False):
+    """
+    Write a cache file atomically
+    Args:
+        cache_file: destination cache file
+        payload: bytes-like file content
+        durable: fsync the data before publishing it
+    """
+    # Write to a temporary file and rename it into place, so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, prefix=cache_file.name, suffix=_TEMP_SUFFIX)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, cache_file)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+def _dump_cache_file(cache_file: Path, cache_data: Dict[str, Any], durable: bool = False) -> int:
+    """Serialize a cache entry to disk, compressing it only when that pays off, and return its pickled size"""
+    payload = pickle.dumps(cache_data, protocol=pickle.HIGHEST_PROTOCOL)
+    pickled_size = len(payload)
+    if _is_compressible(payload):
+        payload = _compress(payload)
+    _write_cache_bytes(cache_file, payload, durable)
+    return pickled_size
+
+def _dump_arrow_cache_file(cache_file: Path, table, durable: bool = False):
+    """Write an Arrow table uncompressed in IPC file format, so reads can memory-map it"""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    _write_cache_bytes(cache_file, sink.getvalue(), durable)
+
+def _load_cache_value(cache_file: Path) -> tuple:
+    """Read a cached value from disk, memory-mapping Arrow files instead of unpickling, as (value, size)"""
+    with open(cache_file, 'rb') as f:
+        head = f.read(len(_ARROW_MAGIC))
+        if head != _ARROW_MAGIC:
+            data = head + f.read()
+            if not data.startswith(_PICKLE_MAGIC):
+                data = _decompress(data)
+            return pickle.loads(data)['value'], len(data)
+    
+    if not HAS_PYARROW:
+        raise ValueError("Arrow cache file requires the pyarrow package")
+    table = pa.ipc.open_file(pa.memory_map(str(cache_file))).read_all()
+    return table, table.nbytes
+
+def _estimate_size(value: Any) -> int:
+    """Estimate a value's size in bytes including nested contents, unlike sys.getsizeof"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if HAS_PYARROW and isinstance(value, pa.Table):
+        return value.nbytes
+    if hasattr(value, 'memory_usage') and hasattr(value, 'dtypes'):
+        # pandas DataFrame or Series; deep=True counts object columns such as strings
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+def _set_gc_thresholds():
+    """Apply the tuned gc thresholds once per process"""
+    global _gc_thresholds_set
+    if not _gc_thresholds_set:
+        gc.set_threshold(*_GC_THRESHOLDS)
+        _gc_thresholds_set = True
+
+def register_cache(cache):
+    """
+    Register an in-memory cache to be cleared when memory runs high
+    Args:
+        cache: object with clear_memory_cache() (e.g. CacheManager) or a
+            functools.lru_cache wrapper; held by weak reference
+    """
+    _REGISTERED_CACHES.add(cache)
+
+@lru_cache(maxsize=1)
+def _cpu_count() -> int:
+    """Get the logical CPU count, looked up once per process"""
+    return psutil.cpu_count(logical=True) or 1
+
+@lru_cache(maxsize=1)
+def _total_memory_gb() -> float:
+    """Get total physical memory in GB, looked up once per process"""
+    return psutil.virtual_memory().total / (1024**3)
+
+def _wait_for_monitor_event(timeout: float):
+    """Sleep until the next scheduled tick, waking early when a tick is added"""
+    _monitor_wakeup.wait(timeout)
+    _monitor_wakeup.clear()
+
+_monitor_scheduler = sched.scheduler(time.monotonic, _wait_for_monitor_event)
+
+def _run_monitor_scheduler():
+    """Run queued profiler ticks until none remain"""
+    global _monitor_thread
+    while True:
+        _monitor_scheduler.run()
+        with _monitor_lock:
+            if _monitor_scheduler.empty():
+                _monitor_thread = None
+                return
+
+def _schedule_monitor_tick(delay: float, action: Callable, *args):
+    """Queue a profiler tick on the shared timer thread, starting it if needed"""
+    global _monitor_thread
+    with _monitor_lock:
+        _monitor_scheduler.enter(delay, 1, action, args)
+        _monitor_wakeup.set()
+        if _monitor_thread is None:
+            _monitor_thread = threading.Thread(target=_run_monitor_scheduler, daemon=True)
+            _monitor_thread.start()
+
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Get the shared process pool, replacing it if more workers are needed"""
+    global _process_pool, _process_pool_workers
+    with _process_pool_lock:
+        if _process_pool is None or _process_pool_workers < workers:
+            # Size for every core up front so batches rarely need a bigger pool. A pool being
+            # replaced is not shut down: other threads may still be mapping over it, and it
+            # exits on its own once their work is done and it is no longer referenced
+            pool_workers = max(workers, _cpu_count())
+            # Workers only run batch tasks, so they get the tuned gc thresholds
+            _process_pool = ProcessPoolExecutor(
+                max_workers=pool_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_set_gc_thresholds
+            )
+            _process_pool_workers = pool_workers
+        return _process_pool
+
+def _discard_process_pool(pool: ProcessPoolExecutor):
+    """Drop a broken shared pool so the next batch gets a fresh one"""
+    global _process_pool, _process_pool_workers
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+            _process_pool_workers = 0
+    pool.shutdown(wait=False)
+
+def _pickle_task(task: Callable) -> bytes:
+    """Serialize a task for a worker process, with cloudpickle when it is installed"""
+    if HAS_CLOUDPICKLE:
+        return cloudpickle.dumps(task)
+    return pickle.dumps(task, protocol=pickle.HIGHEST_PROTOCOL)
+
+def _run_task(task) -> tuple:
+    """Run a task, unpickling it first in a worker process, returning (succeeded, result or error message)"""
+    if isinstance(task, bytes):
+        # cloudpickle output is plain pickle data that references cloudpickle helpers
+        task = pickle.loads(task)
+    try:
+        return True, task()
+    except Exception as e:
+        return False, str(e)
+
+def _cpu_busy_idle(cpu_times) -> tuple:
+    """Split a psutil.cpu_times() snapshot into (busy, idle) seconds"""
+    idle = cpu_times.idle + getattr(cpu_times, 'iowait', 0.0)
+    # Linux already counts guest time inside user/nice
+    total = sum(cpu_times) - getattr(cpu_times, 'guest', 0.0) - getattr(cpu_times, 'guest_nice', 0.0)
+    return total - idle, idle
+
+def _run_task_chunk(tasks: List[Callable]) -> List[tuple]:
+    """Run a chunk of tasks in one worker call"""
+    return [_run_task(task) for task in tasks]
+
+def _unlink_cache_file(path) -> bool:
+    """Delete a cache file, returning False when it is still in use"""
+    # A memory-mapped Arrow table keeps its file open, and Windows refuses to delete open files
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        _log_warning(f"Could not remove cache file {path}: {str(e)}")
+        return False
+    return True
+
+def _parse_cache_name(name: str):
+    """Split a cache file name into its key and expiry epoch (None for legacy names)"""
+    stem = name[:-len(_CACHE_SUFFIX)]
+    key, _, expiry = stem.rpartition('.')
+    if key and expiry.isdigit():
+        return key, int(expiry)
+    return stem, None
+
+def _cache_file_expiry(cache_file) -> float:
+    """Get the expiry epoch of a cache file without opening it"""
+    _, expiry = _parse_cache_name(cache_file.name)
+    if expiry is None:
+        # Legacy "{key}.cache" files carry no expiry; assume the default TTL from mtime
+        return cache_file.stat().st_mtime + _DEFAULT_CACHE_TTL_HOURS * 3600
+    return expiry
+
+@dataclass(frozen=True)
 class PerformanceMetrics:
     """Performance metrics data class"""
+    __slots__ = ('cpu_usage', 'memory_usage', 'memory_available', 'disk_usage',
+                 'active_threads', 'cache_hit_rate', 'execution_time', 'timestamp')
+    
     cpu_usage: float
     memory_usage: float
     memory_available: float
@@ -28,18 +385,37 @@ class PerformanceMetrics:
     cache_hit_rate: float
     execution_time: float
     timestamp: datetime
+    
+    def __reduce__(self):
+        # Default slot-state pickling restores via setattr, which a frozen class rejects
+        return (self.__class__, tuple(getattr(self, name) for name in self.__slots__))
+
+@dataclass(frozen=True)
+class _BatchRun:
+    """Batch execution record kept by ConcurrencyOptimizer"""
+    __slots__ = ('task_count', 'workers', 'execution_time', 'throughput', 'timestamp')
+    
+    task_count: int
+    workers: int
+    execution_time: float
+    throughput: float
+    timestamp: datetime
 
 class MemoryOptimizer:
     """Memory usage optimization"""
     
-    def __init__(self, max_memory_usage: float = 0.8):
+    def __init__(self, max_memory_usage: float = 0.8, tune_gc: bool = False):
         """
         Initialize memory optimizer
         Args:
             max_memory_usage: maximum memory usage threshold (0.0-1.0)
+            tune_gc: raise the gc thresholds for the whole process; leave off in the
+                UI process, where it would also change Streamlit's collector
         """
         self.max_memory_usage = max_memory_usage
         self.memory_monitor = MemoryMonitor()
+        if tune_gc:
+            _set_gc_thresholds()
     
     @error_handler(Exception, show_error=True)
     def optimize_memory_usage(self):
@@ -47,43 +423,52 @@ class MemoryOptimizer:
         current_usage = self.memory_monitor.get_memory_usage()
         
         if current_usage > self.max_memory_usage:
-            ErrorHandler.log_warning(f"High memory usage detected: {current_usage:.1%}")
-            
-            # Force garbage collection
-            collected = gc.collect()
-            ErrorHandler.log_info(f"Garbage collection freed {collected} objects")
+            _log_warning(f"High memory usage detected: {current_usage:.1%}")
             
-            # Clear caches if available
+            # Clear caches first so a single collection can reclaim what they held
             self._clear_caches()
             
-            # Check memory usage after optimization
-            new_usage = self.memory_monitor.get_memory_usage()
+            # Only pay for a full collection if objects reached the oldest generation since the last one
+            generation = 2 if gc.get_count()[2] else 0
+            collected = gc.collect(generation)
+            _log_info(f"Garbage collection freed {collected} objects")
+            
+            # Check memory usage after optimization (bypass the cached snapshot)
+            new_usage = self.memory_monitor.get_memory_usage(refresh=True)
             improvement = current_usage - new_usage
             
             if improvement > 0.05:  # 5% improvement
-                ErrorHandler.log_info(f"Memory optimization successful: {improvement:.1%} freed")
+                _log_info(f"Memory optimization successful: {improvement:.1%} freed")
             else:
-                ErrorHandler.log_warning("Memory optimization had minimal effect")
+                _log_warning("Memory optimization had minimal effect")
     
     def _clear_caches(self):
-        """Clear internal caches"""
-        try:
-            # Clear any cached data
-            if hasattr(self, '_cache'):
-                self._cache.clear()
-            
-            # Force garbage collection again
-            gc.collect()
-            
-        except Exception as e:
-            ErrorHandler.log_warning(f"Error clearing caches: {str(e)}")
+        """Clear registered in-memory caches"""
+        for cache in list(_REGISTERED_CACHES):
+            try:
+                if hasattr(cache, 'clear_memory_cache'):
+                    cache.clear_memory_cache()
+                else:
+                    cache.cache_clear()
+            except Exception as e:
+                _log_warning(f"Error clearing caches: {str(e)}")
     
-    def get_memory_recommendations(self) -> List[str]:
-        """Get memory optimization recommendations"""
+    def get_memory_recommendations(self, memory_info: Optional[Dict[str, float]] = None) -> List[str]:
+        """
+        Get memory optimization recommendations
+        Args:
+            memory_info: Snapshot from MemoryMonitor.get_memory_info(), reused instead of querying again
+        Returns:
+            List of recommendation messages
+        """
         recommendations = []
         
-        usage = self.memory_monitor.get_memory_usage()
-        available = self.memory_monitor.get_available_memory()
+        if memory_info is not None:
+            usage = memory_info['usage_percent'] / 100.0
+            available = memory_info['available_mb']
+        else:
+            usage = self.memory_monitor.get_memory_usage()
+            available = self.memory_monitor.get_available_memory()
         
         if usage > 0.8:
             recommendations.append("High memory usage - consider reducing concurrent executions")
@@ -99,16 +484,21 @@ class MemoryOptimizer:
 class ConcurrencyOptimizer:
     """Concurrency and parallel execution optimization"""
     
-    def __init__(self):
-        """Initialize concurrency optimizer"""
-        self.cpu_count = psutil.cpu_count()
+    def __init__(self, max_workers_cap: int = 32):
+        """
+        Initialize concurrency optimizer
+        Args:
+            max_workers_cap: upper bound on the calculated number of workers
+        """
+        self.cpu_count = _cpu_count()
+        self.max_workers_cap = max_workers_cap
         self.optimal_workers = self._calculate_optimal_workers()
         self.performance_history = []
     
     def _calculate_optimal_workers(self) -> int:
         """Calculate optimal number of worker threads"""
         # Base on CPU count and system resources
-        memory_gb = psutil.virtual_memory().total / (1024**3)
+        memory_gb = _total_memory_gb()
         
         # Conservative approach: use 75% of CPU cores
         cpu_workers = max(1, int(self.cpu_count * 0.75))
@@ -117,20 +507,22 @@ class ConcurrencyOptimizer:
         memory_workers = max(1, int(memory_gb / 0.5))
         
         # Use the minimum to avoid resource exhaustion
-        optimal = min(cpu_workers, memory_workers, 8)  # Cap at 8 workers
+        optimal = min(cpu_workers, memory_workers, self.max_workers_cap)
         
-        ErrorHandler.log_info(f"Calculated optimal workers: {optimal} (CPU: {cpu_workers}, Memory: {memory_workers})")
+        _log_info(f"Calculated optimal workers: {optimal} (CPU: {cpu_workers}, Memory: {memory_workers})")
         return optimal
     
     @error_handler(Exception, show_error=True)
     def optimize_execution_batch(self, 
                                 tasks: List[Callable],
-                                max_workers: int = None) -> List[Any]:
+                                max_workers: int = None,
+                                cpu_bound: bool = False) -> List[Any]:
         """
         Optimize batch execution of tasks
         Args:
             tasks: list of callable tasks
             max_workers: maximum number of workers (None for auto)
+            cpu_bound: run tasks in worker processes instead of threads
         Returns:
             list of task results
         """
@@ -140,49 +532,99 @@ class ConcurrencyOptimizer:
         workers = max_workers or self.optimal_workers
         workers = min(workers, len(tasks))  # Don't use more workers than tasks
         
-        ErrorHandler.log_info(f"Executing {len(tasks)} tasks with {workers} workers")
+        _log_info(f"Executing {len(tasks)} tasks with {workers} workers")
         
         start_time = time.time()
-        results = []
+        results = [None] * len(tasks)
         
         try:
-            with ThreadPoolExecutor(max_workers=workers) as executor:
-                # Submit all tasks
-                future_to_task = {executor.submit(task): i for i, task in enumerate(tasks)}
-                
-                # Collect results as they complete
-                for future in as_completed(future_to_task):
-                    task_index = future_to_task[future]
+            chunksize = max(1, len(tasks) // (workers * 4))
+            if cpu_bound:
+                # Pure-Python work does not parallelize across threads under the GIL
+                # Tasks that cannot be pickled fail on their own instead of aborting the batch
+                indices, payloads = [], []
+                for task_index, task in enumerate(tasks):
                     try:
-                        result = future.result()
-                        results.append((task_index, result))
+                        payloads.append(_pickle_task(task))
+                        indices.append(task_index)
                     except Exception as e:
-                        ErrorHandler.log_error(f"Task {task_index} failed: {str(e)}")
-                        results.append((task_index, None))
+                        _log_error(f"Task {task_index} failed: cannot be sent to a worker process: {str(e)}")
+                
+                executor = _get_process_pool(workers)
+                try:
+                    outcomes = executor.map(_run_task, payloads, chunksize=chunksize)
+                    self._collect_outcomes(outcomes, results, indices)
+                except BrokenProcessPool as e:
+                    # A worker died (e.g. a task called os._exit or crashed the interpreter);
+                    # the pool is unusable, so replace it and leave unfinished tasks as failed
+                    _discard_process_pool(executor)
+                    _log_error(f"Worker process died, unfinished tasks failed: {str(e)}")
+            elif self._tasks_are_cheap():
+                # Per-future overhead dominates short tasks; hand each worker a chunk of tasks.
+                # ThreadPoolExecutor.map ignores chunksize, so the chunks are built here
+                chunks = [tasks[i:i + chunksize] for i in range(0, len(tasks), chunksize)]
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    outcomes = chain.from_iterable(executor.map(_run_task_chunk, chunks))
+                    self._collect_outcomes(outcomes, results)
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    # Submit all tasks
+                    future_to_task = {executor.submit(task): i for i, task in enumerate(tasks)}
+                    
+                    # Collect results as they complete
+                    for future in as_completed(future_to_task):
+                        task_index = future_to_task[future]
+                        try:
+                            results[task_index] = future.result()
+                        except Exception as e:
+                            _log_error(f"Task {task_index} failed: {str(e)}")
             
-            # Sort results by original task order
-            results.sort(key=lambda x: x[0])
             execution_time = time.time() - start_time
             
             # Record performance metrics
             self._record_performance(len(tasks), workers, execution_time)
             
-            ErrorHandler.log_info(f"Batch execution completed in {execution_time:.2f}s")
-            return [result[1] for result in results]
+            _log_info(f"Batch execution completed in {execution_time:.2f}s")
+            return results
             
         except Exception as e:
-            ErrorHandler.log_error(f"Batch execution failed: {str(e)}")
+            _log_error(f"Batch execution failed: {str(e)}")
             raise
     
+    def _collect_outcomes(self, outcomes, results: List[Any], indices: Optional[List[int]] = None):
+        """
+        Store (succeeded, result) outcomes in task order, logging failed tasks
+        Args:
+            outcomes: iterable of (succeeded, result or error message)
+            results: list of task results to fill in
+            indices: task index of each outcome (default: outcomes cover every task in order)
+        """
+        if indices is None:
+            indices = range(len(results))
+        for task_index, (succeeded, result) in zip(indices, outcomes):
+            if succeeded:
+                results[task_index] = result
+            else:
+                _log_error(f"Task {task_index} failed: {result}")
+    
+    def _tasks_are_cheap(self) -> bool:
+        """Check whether recent batches averaged under _CHEAP_TASK_SECONDS per task"""
+        recent_runs = self.performance_history[-10:]
+        if not recent_runs:
+            return False
+        
+        task_seconds = sum(run.execution_time * run.workers for run in recent_runs)
+        return task_seconds / sum(run.task_count for run in recent_runs) < _CHEAP_TASK_SECONDS
+    
     def _record_performance(self, task_count: int, workers: int, execution_time: float):
         """Record performance metrics for future optimization"""
-        metric = {
-            'task_count': task_count,
-            'workers': workers,
-            'execution_time': execution_time,
-            'throughput': task_count / execution_time,
-            'timestamp': datetime.now()
-        }
+        metric = _BatchRun(
+            task_count=task_count,
+            workers=workers,
+            execution_time=execution_time,
+            throughput=task_count / execution_time,
+            timestamp=datetime.now()
+        )
         
         self.performance_history.append(metric)
         
@@ -197,7 +639,7 @@ class ConcurrencyOptimizer:
         
         # Analyze recent performance
         recent_metrics = self.performance_history[-10:]
-        avg_throughput = sum(m['throughput'] for m in recent_metrics) / len(recent_metrics)
+        avg_throughput = sum(m.throughput for m in recent_metrics) / len(recent_metrics)
         
         recommendations = {
             'current_optimal_workers': self.optimal_workers,
@@ -208,10 +650,10 @@ class ConcurrencyOptimizer:
         # Analyze worker efficiency
         worker_performance = {}
         for metric in recent_metrics:
-            workers = metric['workers']
+            workers = metric.workers
             if workers not in worker_performance:
                 worker_performance[workers] = []
-            worker_performance[workers].append(metric['throughput'])
+            worker_performance[workers].append(metric.throughput)
         
         # Find best performing worker count
         best_workers = None
@@ -233,18 +675,35 @@ class ConcurrencyOptimizer:
 class CacheManager:
     """Intelligent caching system"""
     
-    def __init__(self, cache_dir: str = "cache", max_cache_size_mb: int = 500):
+    def __init__(self, cache_dir: str = "cache", max_cache_size_mb: int = 500,
+                 sizer: Optional[Callable[[Any], int]] = None):
         """
         Initialize cache manager
         Args:
             cache_dir: directory for cache files
             max_cache_size_mb: maximum cache size in MB
+            sizer: function estimating a value's size in bytes (defaults to the pickled
+                size, which counts nested contents)
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
         self.max_cache_size = max_cache_size_mb * 1024 * 1024  # Convert to bytes
         self.cache_stats = {'hits': 0, 'misses': 0}
-        self._memory_cache = {}
+        
+        # LRU memory tier, bounded to a fraction of the disk budget
+        self._memory_cache = OrderedDict()
+        self._memory_sizes = {}
+        self._memory_bytes = 0
+        self._sizer = sizer
+        register_cache(self)
+        
+        # Index of key -> cache file, so lookups never scan the directory
+        self._key_paths = {}
+        for entry in self._scan_cache_files():
+            key, _ = _parse_cache_name(entry.name)
+            self._key_paths[key] = Path(entry.path)
+        self._shard_dirs = set()
+        self._last_cleanup = 0.0
     
     @error_handler(Exception, show_error=True)
     def get(self, key: str, default=None) -> Any:
@@ -258,101 +717,225 @@ class CacheManager:
         """
         # Try memory cache first
         if key in self._memory_cache:
+            self._memory_cache.move_to_end(key)
             self.cache_stats['hits'] += 1
             return self._memory_cache[key]
         
-        # Try disk cache
-        cache_file = self.cache_dir / f"{key}.cache"
-        if cache_file.exists():
+        # Try disk cache; fall back to the key's shard when another instance wrote it
+        cache_file = self._key_paths.get(key)
+        if cache_file is None or not cache_file.exists():
+            cache_file = self._find_cache_file(key)
+        if cache_file is not None:
             try:
-                with gzip.open(cache_file, 'rb') as f:
-                    data = pickle.load(f)
-                
-                # Add to memory cache for faster access
-                self._memory_cache[key] = data
-                self.cache_stats['hits'] += 1
-                return data
+                if time.time() > _cache_file_expiry(cache_file):
+                    self._remove_cache_file(key, cache_file)
+                else:
+                    data, size = _load_cache_value(cache_file)
+                    
+                    # Add to memory cache for faster access
+                    self._remember(key, data, size)
+                    self.cache_stats['hits'] += 1
+                    return data
                 
             except Exception as e:
-                ErrorHandler.log_warning(f"Error reading cache file {key}: {str(e)}")
+                _log_warning(f"Error reading cache file {key}: {str(e)}")
                 # Remove corrupted cache file
-                cache_file.unlink(missing_ok=True)
+                self._remove_cache_file(key, cache_file)
         
         self.cache_stats['misses'] += 1
         return default
     
     @error_handler(Exception, show_error=True)
-    def set(self, key: str, value: Any, ttl_hours: int = 24):
+    def set(self, key: str, value: Any, ttl_hours: int = 24, durable: bool = False,
+            format_type: str = 'pickle'):
         """
         Set item in cache
         Args:
             key: cache key
             value: value to cache
             ttl_hours: time to live in hours
+            durable: fsync the cache file before it replaces any previous one
+            format_type: 'pickle' for any object, or 'arrow' for a pyarrow.Table
+                that is memory-mapped on read instead of unpickled
         """
-        # Add to memory cache
-        self._memory_cache[key] = value
+        if format_type == 'arrow':
+            if not HAS_PYARROW:
+                raise DataError("Arrow cache format requires the pyarrow package")
+            if not isinstance(value, pa.Table):
+                raise DataError("Arrow cache format requires a pyarrow.Table value")
+        elif format_type != 'pickle':
+            raise DataError(f"Unsupported cache format: {format_type}")
         
-        # Save to disk cache
-        cache_file = self.cache_dir / f"{key}.cache"
+        # Save to disk cache, with the expiry encoded in the file name
+        payload_size = None
+        created = datetime.now()
+        expiry = int((created + timedelta(hours=ttl_hours)).timestamp())
+        cache_file = self._shard_dir(key) / f"{key}.{expiry}{_CACHE_SUFFIX}"
         try:
-            cache_data = {
-                'value': value,
-                'created': datetime.now(),
-                'ttl_hours': ttl_hours
-            }
+            if format_type == 'arrow':
+                _dump_arrow_cache_file(cache_file, value, durable)
+                payload_size = value.nbytes
+            else:
+                cache_data = {
+                    'value': value,
+                    'created': created,
+                    'ttl_hours': ttl_hours
+                }
+                
+                payload_size = _dump_cache_file(cache_file, cache_data, durable)
             
-            with gzip.open(cache_file, 'wb') as f:
-                pickle.dump(cache_data, f)
+            previous_file = self._key_paths.get(key)
+            self._key_paths[key] = cache_file
+            if previous_file is not None and previous_file != cache_file:
+                _unlink_cache_file(previous_file)
             
-            # Clean up old cache files if needed
-            self._cleanup_cache()
+            # Clean up old cache files if needed, at most once per interval
+            now = time.monotonic()
+            if now - self._last_cleanup >= _CACHE_CLEANUP_INTERVAL:
+                self._last_cleanup = now
+                self._cleanup_cache()
             
         except Exception as e:
-            ErrorHandler.log_warning(f"Error writing cache file {key}: {str(e)}")
+            _log_warning(f"Error writing cache file {key}: {str(e)}")
+        
+        # Add to memory cache, sized from the payload just serialized when there is one
+        self._remember(key, value, payload_size)
+    
+    def _shard_dir(self, key: str) -> Path:
+        """Get the sub-directory for a key, spreading files over 256 shards"""
+        shard_dir = self.cache_dir / hashlib.sha1(key.encode('utf-8')).hexdigest()[:2]
+        if shard_dir not in self._shard_dirs:
+            shard_dir.mkdir(exist_ok=True)
+            self._shard_dirs.add(shard_dir)
+        return shard_dir
+    
+    def _find_cache_file(self, key: str) -> Optional[Path]:
+        """Look up a key's cache file in its shard and the legacy top level, refreshing the index"""
+        candidates = []
+        shard_dir = self.cache_dir / hashlib.sha1(key.encode('utf-8')).hexdigest()[:2]
+        if shard_dir.is_dir():
+            with os.scandir(shard_dir) as shard:
+                candidates.extend(
+                    e for e in shard
+                    if e.name.endswith(_CACHE_SUFFIX) and _parse_cache_name(e.name)[0] == key
+                )
+        legacy_file = self.cache_dir / f"{key}{_CACHE_SUFFIX}"
+        
+        if candidates:
+            # Another writer may not have removed its previous file yet; the latest expiry wins
+            cache_file = Path(max(candidates, key=_cache_file_expiry).path)
+        elif legacy_file.is_file():
+            cache_file = legacy_file
+        else:
+            self._key_paths.pop(key, None)
+            return None
+        self._key_paths[key] = cache_file
+        return cache_file
+    
+    def _scan_cache_files(self, suffix=_CACHE_SUFFIX) -> List[os.DirEntry]:
+        """
+        List cache files in the shard directories and legacy top-level files
+        Args:
+            suffix: file name suffix, or tuple of suffixes, to match; pass _TEMP_SUFFIX
+                to include unfinished writes
+        Returns:
+            matching directory entries
+        """
+        # DirEntry caches its stat() result, so callers stat each file at most once
+        entries = []
+        with os.scandir(self.cache_dir) as top_level:
+            for entry in top_level:
+                if entry.name.endswith(suffix):
+                    entries.append(entry)
+                elif len(entry.name) == 2 and entry.is_dir():
+                    with os.scandir(entry.path) as shard:
+                        entries.extend(e for e in shard if e.name.endswith(suffix))
+        return entries
+    
+    def _remember(self, key: str, value: Any, payload_size: Optional[int] = None):
+        """
+        Add a value to the memory tier and evict least recently used entries over budget
+        Args:
+            key: cache key
+            value: value to keep in memory
+            payload_size: serialized size already known from writing or reading the cache file
+        """
+        self._forget(key)
+        if self._sizer is not None:
+            size = self._sizer(value)
+        elif payload_size is not None:
+            size = payload_size
+        else:
+            size = _estimate_size(value)
+        self._memory_cache[key] = value
+        self._memory_sizes[key] = size
+        self._memory_bytes += size
+        
+        budget = self.max_cache_size // _MEMORY_CACHE_FRACTION
+        while self._memory_bytes > budget and self._memory_cache:
+            evicted_key, _ = self._memory_cache.popitem(last=False)
+            self._memory_bytes -= self._memory_sizes.pop(evicted_key)
+    
+    def _forget(self, key: str):
+        """Drop a value from the memory tier"""
+        if key in self._memory_sizes:
+            del self._memory_cache[key]
+            self._memory_bytes -= self._memory_sizes.pop(key)
+    
+    def _remove_cache_file(self, key: str, cache_file: Path):
+        """Delete a cache file and drop it from the key index"""
+        # A file still in use is dropped from the index anyway; a later cleanup retries it
+        _unlink_cache_file(cache_file)
+        if self._key_paths.get(key) == cache_file:
+            del self._key_paths[key]
+            self._forget(key)
     
     def _cleanup_cache(self):
         """Clean up old and oversized cache files"""
         try:
-            cache_files = list(self.cache_dir.glob("*.cache"))
+            cache_files = []
+            temp_size = 0
             
-            # Remove expired files
-            now = datetime.now()
-            for cache_file in cache_files[:]:
-                try:
-                    with gzip.open(cache_file, 'rb') as f:
-                        data = pickle.load(f)
-                    
-                    created = data.get('created', now)
-                    ttl_hours = data.get('ttl_hours', 24)
-                    
-                    if now - created > timedelta(hours=ttl_hours):
-                        cache_file.unlink()
-                        cache_files.remove(cache_file)
-                        
-                except Exception:
-                    # Remove corrupted files
-                    cache_file.unlink(missing_ok=True)
-                    if cache_file in cache_files:
-                        cache_files.remove(cache_file)
+            now = time.time()
+            for entry in self._scan_cache_files((_CACHE_SUFFIX, _TEMP_SUFFIX)):
+                if entry.name.endswith(_TEMP_SUFFIX):
+                    # Remove temporary files a crashed writer left behind; recent ones
+                    # may still be in use, but their bytes count against the budget
+                    if now - entry.stat().st_mtime > _STALE_TEMP_SECONDS:
+                        _unlink_cache_file(entry.path)
+                    else:
+                        temp_size += entry.stat().st_size
+                    continue
+                
+                # Remove expired files, judged from the file name alone
+                key, _ = _parse_cache_name(entry.name)
+                if now > _cache_file_expiry(entry):
+                    self._remove_cache_file(key, Path(entry.path))
+                else:
+                    cache_files.append(entry)
             
             # Check total cache size
-            total_size = sum(f.stat().st_size for f in cache_files)
+            total_size = temp_size + sum(entry.stat().st_size for entry in cache_files)
             
             if total_size > self.max_cache_size:
                 # Remove oldest files first
-                cache_files.sort(key=lambda f: f.stat().st_mtime)
+                cache_files.sort(key=lambda entry: entry.stat().st_mtime)
                 
-                while total_size > self.max_cache_size and cache_files:
-                    oldest_file = cache_files.pop(0)
-                    file_size = oldest_file.stat().st_size
-                    oldest_file.unlink()
-                    total_size -= file_size
+                for oldest in cache_files:
+                    if total_size <= self.max_cache_size:
+                        break
+                    if not _unlink_cache_file(oldest.path):
+                        continue
+                    total_size -= oldest.stat().st_size
+                    
+                    key, _ = _parse_cache_name(oldest.name)
+                    if self._key_paths.get(key) == Path(oldest.path):
+                        del self._key_paths[key]
                     
-                    ErrorHandler.log_info(f"Removed old cache file: {oldest_file.name}")
+                    _log_info(f"Removed old cache file: {oldest.name}")
             
         except Exception as e:
-            ErrorHandler.log_warning(f"Error during cache cleanup: {str(e)}")
+            _log_warning(f"Error during cache cleanup: {str(e)}")
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
@@ -360,8 +943,8 @@ class CacheManager:
         hit_rate = self.cache_stats['hits'] / total_requests if total_requests > 0 else 0
         
         # Calculate cache size
-        cache_files = list(self.cache_dir.glob("*.cache"))
-        total_size = sum(f.stat().st_size for f in cache_files)
+        cache_files = self._scan_cache_files()
+        total_size = sum(entry.stat().st_size for entry in cache_files)
         
         return {
             'hit_rate': hit_rate,
@@ -373,19 +956,26 @@ class CacheManager:
             'memory_cache_items': len(self._memory_cache)
         }
     
+    def clear_memory_cache(self):
+        """Drop the in-memory tier, keeping disk cache files"""
+        self._memory_cache.clear()
+        self._memory_sizes.clear()
+        self._memory_bytes = 0
+    
     def clear_cache(self):
         """Clear all cache"""
         # Clear memory cache
-        self._memory_cache.clear()
+        self.clear_memory_cache()
         
         # Clear disk cache
-        for cache_file in self.cache_dir.glob("*.cache"):
-            cache_file.unlink()
+        for entry in self._scan_cache_files((_CACHE_SUFFIX, _TEMP_SUFFIX)):
+            _unlink_cache_file(entry.path)
+        self._key_paths.clear()
         
         # Reset stats
         self.cache_stats = {'hits': 0, 'misses': 0}
         
-        ErrorHandler.log_info("Cache cleared")
+        _log_info("Cache cleared")
 
 class MemoryMonitor:
     """System memory monitoring"""
@@ -393,32 +983,48 @@ class MemoryMonitor:
     def __init__(self):
         """Initialize memory monitor"""
         self.process = psutil.Process()
+        self._vm_cache = None
+        self._vm_ts = 0.0
+    
+    def _virtual_memory(self, refresh: bool = False):
+        """Get a virtual memory snapshot, reused for a short TTL"""
+        now = time.monotonic()
+        if refresh or self._vm_cache is None or now - self._vm_ts >= _VM_CACHE_TTL:
+            self._vm_cache = psutil.virtual_memory()
+            self._vm_ts = now
+        return self._vm_cache
     
-    def get_memory_usage(self) -> float:
+    def get_memory_usage(self, refresh: bool = False) -> float:
         """Get current memory usage as percentage"""
-        return psutil.virtual_memory().percent / 100.0
+        return self._virtual_memory(refresh).percent / 100.0
     
     def get_available_memory(self) -> float:
         """Get available memory in MB"""
-        return psutil.virtual_memory().available / (1024 * 1024)
+        return self._virtual_memory().available * _MB
     
     def get_process_memory(self) -> float:
         """Get current process memory usage in MB"""
-        return self.process.memory_info().rss / (1024 * 1024)
+        return self.process.memory_info().rss * _MB
+    
+    def get_memory_info_fast(self) -> Dict[str, float]:
+        """Get system memory information, without the per-process figures"""
+        vm = self._virtual_memory()
+        
+        return {
+            'total_mb': vm.total * _MB,
+            'available_mb': vm.available * _MB,
+            'used_mb': vm.used * _MB,
+            'usage_percent': vm.percent
+        }
     
     def get_memory_info(self) -> Dict[str, float]:
         """Get comprehensive memory information"""
-        vm = psutil.virtual_memory()
+        memory_info = self.get_memory_info_fast()
         process_memory = self.get_process_memory()
         
-        return {
-            'total_mb': vm.total / (1024 * 1024),
-            'available_mb': vm.available / (1024 * 1024),
-            'used_mb': vm.used / (1024 * 1024),
-            'usage_percent': vm.percent,
-            'process_memory_mb': process_memory,
-            'process_memory_percent': (process_memory / (vm.total / (1024 * 1024))) * 100
-        }
+        memory_info['process_memory_mb'] = process_memory
+        memory_info['process_memory_percent'] = process_memory / memory_info['total_mb'] * 100
+        return memory_info
 
 class DataCompressor:
     """Data compression utilities"""
@@ -427,20 +1033,29 @@ class DataCompressor:
     def compress_backtest_results(results: List[BacktestResult]) -> bytes:
         """Compress backtest results for storage"""
         try:
-            # Convert to serializable format
-            data = [result.to_dict() for result in results]
-            
-            # Serialize and compress
-            json_data = json.dumps(data, default=str)
-            compressed = gzip.compress(json_data.encode('utf-8'))
+            # Serialize one result at a time straight into the compressor,
+            # so the full JSON document never exists in memory
+            buffer = io.BytesIO()
+            raw_size = 2
+            with _open_compressor(buffer) as stream:
+                stream.write(b'[')
+                for i, result in enumerate(results):
+                    if i:
+                        stream.write(b',')
+                        raw_size += 1
+                    chunk = _dumps_json_bytes(result.to_dict())
+                    stream.write(chunk)
+                    raw_size += len(chunk)
+                stream.write(b']')
+            compressed = buffer.getvalue()
             
-            compression_ratio = len(compressed) / len(json_data.encode('utf-8'))
-            ErrorHandler.log_info(f"Data compressed to {compression_ratio:.1%} of original size")
+            compression_ratio = len(compressed) / raw_size
+            _log_info(f"Data compressed to {compression_ratio:.1%} of original size")
             
             return compressed
             
         except Exception as e:
-            ErrorHandler.log_error(f"Error compressing data: {str(e)}")
+            _log_error(f"Error compressing data: {str(e)}")
             raise
     
     @staticmethod
@@ -448,13 +1063,12 @@ class DataCompressor:
         """Decompress backtest results"""
         try:
             # Decompress and deserialize
-            json_data = gzip.decompress(compressed_data).decode('utf-8')
-            data = json.loads(json_data)
+            data = _loads_json(_decompress(compressed_data))
             
             return data
             
         except Exception as e:
-            ErrorHandler.log_error(f"Error decompressing data: {str(e)}")
+            _log_error(f"Error decompressing data: {str(e)}")
             raise
 
 class PerformanceProfiler:
@@ -462,92 +1076,215 @@ class PerformanceProfiler:
     
     def __init__(self):
         """Initialize performance profiler"""
-        self.metrics_history = []
         self.monitoring_active = False
-        self.monitor_thread = None
+        self._monitor_generation = 0
+        
+        # Samples are kept column-wise in a fixed-size ring buffer so appends
+        # never reallocate and summaries reduce with NumPy
+        self._columns = {name: np.empty(_METRICS_CAPACITY, dtype=dtype) for name, dtype in _METRIC_COLUMNS}
+        self._head = 0
+        self._count = 0
+        self._latest = None
+        self._history_cache = None
+        self._summary_cache = {}
+        self._lock = threading.Lock()
     
-    def start_monitoring(self, interval_seconds: int = 5):
+    @property
+    def metrics_history(self) -> List[PerformanceMetrics]:
+        """
+        The newest 1000 recorded metrics, oldest first
+        Deprecated: builds one object per sample after every new sample; use get_metrics_columns()
+        """
+        warnings.warn(
+            "PerformanceProfiler.metrics_history is deprecated; use get_metrics_columns()",
+            DeprecationWarning, stacklevel=2
+        )
+        with self._lock:
+            if self._history_cache is None:
+                columns = self._copy_columns(
+                    self._window_slices(None, _LEGACY_HISTORY_SIZE), tuple(name for name, _ in _METRIC_COLUMNS)
+                )
+                # tolist() turns datetime64[us] back into datetime objects
+                rows = [values.tolist() for values in columns.values()]
+                self._history_cache = [PerformanceMetrics(*values) for values in zip(*rows)]
+            return self._history_cache
+    
+    def _slices_after(self, cutoff_time: np.datetime64) -> List[slice]:
+        """Get the ring buffer slices holding samples newer than cutoff_time"""
+        timestamps = self._columns['timestamp']
+        if self._count < _METRICS_CAPACITY:
+            runs = ((0, self._count),)
+        else:
+            # A full ring is two sorted runs: [head:] holds the older samples, [:head] the newer
+            runs = ((self._head, _METRICS_CAPACITY), (0, self._head))
+        
+        slices = []
+        for begin, end in runs:
+            # Timestamps only grow, so binary search replaces a scan of every sample
+            start = begin + int(np.searchsorted(timestamps[begin:end], cutoff_time, side='right'))
+            if start < end:
+                slices.append(slice(start, end))
+        return slices
+    
+    def _record_metrics(self, metrics: PerformanceMetrics):
+        """Store a sample in the ring buffer, overwriting the oldest when full"""
+        with self._lock:
+            row = self._head
+            for name, column in self._columns.items():
+                column[row] = getattr(metrics, name)
+            
+            self._head = (row + 1) % _METRICS_CAPACITY
+            self._count = min(self._count + 1, _METRICS_CAPACITY)
+            self._latest = metrics
+            self._history_cache = None
+            self._summary_cache.clear()
+    
+    def start_monitoring(self, interval_seconds: int = _DEFAULT_MONITOR_INTERVAL):
         """Start performance monitoring"""
         if self.monitoring_active:
             return
         
         self.monitoring_active = True
-        self.monitor_thread = threading.Thread(
-            target=self._monitor_loop,
-            args=(interval_seconds,),
-            daemon=True
-        )
-        self.monitor_thread.start()
+        self._monitor_generation += 1
+        self._memory_monitor = MemoryMonitor()
+        # CPU usage is computed from our own cpu_times() deltas rather than
+        # psutil.cpu_percent(), whose module-level state is shared by all callers
+        self._last_cpu = _cpu_busy_idle(psutil.cpu_times())
         
-        ErrorHandler.log_info("Performance monitoring started")
+        _schedule_monitor_tick(0, self._monitor_tick, interval_seconds, self._monitor_generation)
+        
+        _log_info("Performance monitoring started")
     
     def stop_monitoring(self):
         """Stop performance monitoring"""
+        # The pending tick sees the flag and does not reschedule itself
         self.monitoring_active = False
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=1)
         
-        ErrorHandler.log_info("Performance monitoring stopped")
+        _log_info("Performance monitoring stopped")
     
-    def _monitor_loop(self, interval_seconds: int):
-        """Performance monitoring loop"""
-        memory_monitor = MemoryMonitor()
+    def _monitor_tick(self, interval_seconds: int, generation: int):
+        """Collect one sample and schedule the next (runs on the shared timer thread)"""
+        # A tick left over from before a stop/start cycle must not start a second chain
+        if not self.monitoring_active or generation != self._monitor_generation:
+            return
         
-        while self.monitoring_active:
-            try:
-                # Collect metrics
-                cpu_usage = psutil.cpu_percent()
-                memory_info = memory_monitor.get_memory_info()
-                disk_usage = psutil.disk_usage('.').percent
-                active_threads = threading.active_count()
-                
-                metrics = PerformanceMetrics(
-                    cpu_usage=cpu_usage,
-                    memory_usage=memory_info['usage_percent'],
-                    memory_available=memory_info['available_mb'],
-                    disk_usage=disk_usage,
-                    active_threads=active_threads,
-                    cache_hit_rate=0.0,  # Will be updated by cache manager
-                    execution_time=0.0,  # Will be updated by specific operations
-                    timestamp=datetime.now()
-                )
-                
-                self.metrics_history.append(metrics)
-                
-                # Keep only recent history (last 1000 measurements)
-                if len(self.metrics_history) > 1000:
-                    self.metrics_history = self.metrics_history[-1000:]
-                
-                time.sleep(interval_seconds)
-                
-            except Exception as e:
-                ErrorHandler.log_warning(f"Error in performance monitoring: {str(e)}")
-                time.sleep(interval_seconds)
+        try:
+            # Collect metrics
+            busy, idle = _cpu_busy_idle(psutil.cpu_times())
+            last_busy, last_idle = self._last_cpu
+            busy_delta, idle_delta = busy - last_busy, idle - last_idle
+            self._last_cpu = (busy, idle)
+            elapsed = busy_delta + idle_delta
+            cpu_usage = 100.0 * busy_delta / elapsed if elapsed > 0 else 0.0
+            memory_info = self._memory_monitor.get_memory_info_fast()
+            disk_usage = psutil.disk_usage('.').percent
+            active_threads = threading.active_count()
+            
+            metrics = PerformanceMetrics(
+                cpu_usage=cpu_usage,
+                memory_usage=memory_info['usage_percent'],
+                memory_available=memory_info['available_mb'],
+                disk_usage=disk_usage,
+                active_threads=active_threads,
+                cache_hit_rate=0.0,  # Will be updated by cache manager
+                execution_time=0.0,  # Will be updated by specific operations
+                timestamp=datetime.now()
+            )
+            
+            self._record_metrics(metrics)
+            
+        except Exception as e:
+            _log_warning(f"Error in performance monitoring: {str(e)}")
+        
+        _schedule_monitor_tick(interval_seconds, self._monitor_tick, interval_seconds, generation)
     
     def get_current_metrics(self) -> Optional[PerformanceMetrics]:
         """Get current performance metrics"""
-        if self.metrics_history:
-            return self.metrics_history[-1]
-        return None
+        return self._latest
     
-    def get_metrics_summary(self, hours: int = 1) -> Dict[str, float]:
-        """Get performance metrics summary"""
-        if not self.metrics_history:
-            return {}
+    def get_metrics_columns(self, hours: Optional[float] = None, last: Optional[int] = None,
+                            fields: Optional[tuple] = None) -> Dict[str, np.ndarray]:
+        """
+        Get recorded metrics as one array per field, oldest first
         
-        # Filter recent metrics
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        recent_metrics = [m for m in self.metrics_history if m.timestamp > cutoff_time]
+        Args:
+            hours: Only include samples from the last N hours
+            last: Only include the newest N samples
+            fields: Field names to return (default: all PerformanceMetrics fields)
+            
+        Returns:
+            Dictionary of field name to a NumPy array copy; timestamps are datetime64[us]
+        """
+        if fields is None:
+            fields = tuple(name for name, _ in _METRIC_COLUMNS)
         
-        if not recent_metrics:
-            return {}
+        with self._lock:
+            return self._copy_columns(self._window_slices(hours, last), fields)
+    
+    def _window_slices(self, hours: Optional[float], last: Optional[int]) -> List[slice]:
+        """Get the ring buffer slices, oldest first, for a time and sample-count window (lock held)"""
+        if hours is not None:
+            cutoff_time = np.datetime64(datetime.now() - timedelta(hours=hours), 'us')
+            slices = self._slices_after(cutoff_time)
+        elif self._count < _METRICS_CAPACITY:
+            slices = [slice(0, self._count)]
+        else:
+            slices = [slice(self._head, _METRICS_CAPACITY), slice(0, self._head)]
         
+        if last is not None:
+            # Walk back from the newest run so only the newest samples are copied
+            remaining, kept = last, []
+            for s in reversed(slices):
+                if remaining <= 0:
+                    break
+                start = max(s.start, s.stop - remaining)
+                kept.insert(0, slice(start, s.stop))
+                remaining -= s.stop - start
+            slices = kept
+        return slices
+    
+    def _copy_columns(self, slices: List[slice], fields: tuple) -> Dict[str, np.ndarray]:
+        """Copy the given ring buffer slices of each field into contiguous arrays"""
+        # concatenate always copies, so callers never see the ring being overwritten
         return {
-            'avg_cpu_usage': sum(m.cpu_usage for m in recent_metrics) / len(recent_metrics),
-            'max_cpu_usage': max(m.cpu_usage for m in recent_metrics),
-            'avg_memory_usage': sum(m.memory_usage for m in recent_metrics) / len(recent_metrics),
-            'max_memory_usage': max(m.memory_usage for m in recent_metrics),
-            'min_memory_available': min(m.memory_available for m in recent_metrics),
-            'avg_active_threads': sum(m.active_threads for m in recent_metrics) / len(recent_metrics),
-            'max_active_threads': max(m.active_threads for m in recent_metrics)
-        }
\ No newline at end of file
+            name: np.concatenate([self._columns[name][s] for s in slices])
+            if slices else self._columns[name][:0].copy()
+            for name in fields
+        }
+    
+    def get_metrics_summary(self, hours: int = 1) -> Dict[str, float]:
+        """Get performance metrics summary"""
+        # Filter recent metrics
+        cutoff_time = np.datetime64(datetime.now() - timedelta(hours=hours), 'us')
+        with self._lock:
+            slices = self._slices_after(cutoff_time)
+            if not slices:
+                return {}
+            
+            # Reruns between samples cover the same samples, so the reduction is
+            # reused until a new sample arrives or old ones leave the window
+            key = tuple((s.start, s.stop) for s in slices)
+            summary = self._summary_cache.get(key)
+            if summary is None:
+                recent = self._copy_columns(
+                    slices, ('cpu_usage', 'memory_usage', 'memory_available', 'active_threads')
+                )
+                cpu_usage = recent['cpu_usage']
+                memory_usage = recent['memory_usage']
+                memory_available = recent['memory_available']
+                active_threads = recent['active_threads']
+                
+                summary = {
+                    'avg_cpu_usage': float(cpu_usage.mean()),
+                    'max_cpu_usage': float(cpu_usage.max()),
+                    'avg_memory_usage': float(memory_usage.mean()),
+                    'max_memory_usage': float(memory_usage.max()),
+                    'min_memory_available': float(memory_available.min()),
+                    'avg_active_threads': float(active_threads.mean()),
+                    'max_active_threads': int(active_threads.max())
+                }
+                if len(self._summary_cache) >= 8:
+                    self._summary_cache.clear()
+                self._summary_cache[key] = summary
+        
+        return dict(summary)
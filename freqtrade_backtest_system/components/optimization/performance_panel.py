@@ -2,13 +2,23 @@
 Performance monitoring and optimization panel
 """
 import streamlit as st
+import numpy as np
+import psutil
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
+from datetime import datetime
+import io
 from typing import Dict, List, Any
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 from .performance_optimizer import (
     MemoryOptimizer, 
     ConcurrencyOptimizer, 
@@ -18,6 +28,92 @@ from .performance_optimizer import (
 )
 from utils.error_handling import ErrorHandler
 
+# st.fragment (Streamlit >= 1.37) lets the live section rerun on a timer by itself
+HAS_FRAGMENT = hasattr(st, 'fragment')
+
+# How often the live section repaints while monitoring; matches the default sampling interval
+_LIVE_REFRESH_SECONDS = 5
+
+# Upper bound on points sent to the browser per trace; a chart is only ~1000 px wide
+_MAX_CHART_POINTS = 1000
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int = _MAX_CHART_POINTS) -> np.ndarray:
+    """
+    Pick the indices of n_out points that preserve the shape of a series
+    (Largest-Triangle-Three-Buckets downsampling)
+    
+    Args:
+        x: Sorted x values as numbers
+        y: Y values
+        n_out: Number of points to keep, including the first and last
+        
+    Returns:
+        Sorted indices into x and y
+    """
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    
+    x = x.astype(np.float64, copy=False)
+    y = y.astype(np.float64, copy=False)
+    
+    # The first and last points are always kept; the rest are split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    bucket_x = np.append(np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts, x[-1])
+    bucket_y = np.append(np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts, y[-1])
+    
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    anchor = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_x, next_y = bucket_x[bucket + 1], bucket_y[bucket + 1]
+        ax, ay = x[anchor], y[anchor]
+        # Keep the point spanning the largest triangle with the previous pick and the next bucket's mean
+        area = np.abs((ax - next_x) * (y[start:end] - ay) - (ax - x[start:end]) * (next_y - ay))
+        anchor = start + int(area.argmax())
+        selected[bucket + 1] = anchor
+    return selected
+
+def _metrics_csv(columns: Dict[str, np.ndarray]) -> bytes:
+    """Encode profiler metric columns as CSV bytes"""
+    if HAS_PYARROW:
+        # Arrow wraps the NumPy columns without copying and writes straight to bytes
+        buffer = io.BytesIO()
+        pa_csv.write_csv(pa.table(columns), buffer)
+        return buffer.getvalue()
+    return pd.DataFrame(columns, copy=False).to_csv(index=False).encode('utf-8')
+
+def _render_metric_table(columns: Dict[str, List[str]]):
+    """Render a group of metrics as one table instead of one widget per metric"""
+    st.dataframe(
+        pd.DataFrame(columns),
+        width='stretch',
+        hide_index=True
+    )
+
+@st.cache_resource
+def _static_cpu_info() -> Dict[str, Any]:
+    """Get CPU core counts, which do not change while the app runs"""
+    return {
+        'physical_cores': psutil.cpu_count(logical=False),
+        'logical_cores': psutil.cpu_count(logical=True)
+    }
+
+@st.cache_data(ttl=2.0)
+def _dynamic_system_info() -> Dict[str, Any]:
+    """Get CPU frequency and disk figures, reused across reruns for a short TTL"""
+    cpu_freq = psutil.cpu_freq()
+    disk_usage = psutil.disk_usage('.')
+    return {
+        'cpu_freq_mhz': cpu_freq.current if cpu_freq else 0.0,
+        'disk_total_gb': disk_usage.total / (1024**3),
+        'disk_free_gb': disk_usage.free / (1024**3),
+        'disk_usage_percent': (disk_usage.used / disk_usage.total) * 100
+    }
+
 class PerformanceMonitoringPanel:
     """Performance monitoring and optimization panel"""
     
@@ -26,10 +122,14 @@ class PerformanceMonitoringPanel:
         self.memory_optimizer = MemoryOptimizer()
         self.concurrency_optimizer = ConcurrencyOptimizer()
         self.cache_manager = CacheManager()
-        self.profiler = PerformanceProfiler()
         self.memory_monitor = MemoryMonitor()
         
         # Initialize session state
+        # The profiler samples on a background timer, so it must outlive the
+        # panel, which is rebuilt on every rerun
+        if 'performance_profiler' not in st.session_state:
+            st.session_state.performance_profiler = PerformanceProfiler()
+        self.profiler = st.session_state.performance_profiler
         if 'performance_monitoring' not in st.session_state:
             st.session_state.performance_monitoring = False
         if 'performance_data' not in st.session_state:
@@ -39,25 +139,24 @@ class PerformanceMonitoringPanel:
         """Render performance monitoring panel"""
         st.header("⚡ 系统性能监控")
         
-        # Create tabs for different monitoring aspects
-        tab1, tab2, tab3, tab4 = st.tabs([
-            "📊 实时监控", 
-            "🔧 性能优化", 
-            "💾 缓存管理", 
-            "📈 历史分析"
-        ])
-        
-        with tab1:
-            self._render_real_time_monitoring()
-        
-        with tab2:
-            self._render_performance_optimization()
-        
-        with tab3:
-            self._render_cache_management()
-        
-        with tab4:
-            self._render_historical_analysis()
+        # Views for different monitoring aspects. st.tabs would run every tab's
+        # body on each rerun, so only the selected view is rendered
+        views = {
+            "📊 实时监控": self._render_real_time_monitoring,
+            "🔧 性能优化": self._render_performance_optimization,
+            "💾 缓存管理": self._render_cache_management,
+            "📈 历史分析": self._render_historical_analysis
+        }
+        
+        active_view = st.radio(
+            "监控视图",
+            list(views),
+            horizontal=True,
+            key='performance_view',
+            label_visibility="collapsed"
+        )
+        
+        views[active_view]()
     
     def _render_real_time_monitoring(self):
         """Render real-time monitoring tab"""
@@ -74,64 +173,53 @@ class PerformanceMonitoringPanel:
                 st.info("⏸️ 监控已停止")
         
         with col2:
+            # Callbacks run before the script, so this pass already renders the new state
             if not st.session_state.performance_monitoring:
-                if st.button("🚀 开始监控", type="primary"):
-                    self.profiler.start_monitoring()
-                    st.session_state.performance_monitoring = True
-                    st.rerun()
+                st.button("🚀 开始监控", type="primary", on_click=self._start_monitoring)
             else:
-                if st.button("⏹️ 停止监控"):
-                    self.profiler.stop_monitoring()
-                    st.session_state.performance_monitoring = False
-                    st.rerun()
+                st.button("⏹️ 停止监控", on_click=self._stop_monitoring)
         
         with col3:
             if st.button("🔄 刷新数据"):
                 st.rerun()
         
+        if st.session_state.performance_monitoring and HAS_FRAGMENT:
+            # Only the live section repaints on the timer, not the whole page
+            st.fragment(run_every=_LIVE_REFRESH_SECONDS)(self._render_live_metrics)()
+        else:
+            self._render_live_metrics()
+    
+    def _start_monitoring(self):
+        """Start background sampling"""
+        self.profiler.start_monitoring()
+        st.session_state.performance_monitoring = True
+    
+    def _stop_monitoring(self):
+        """Stop background sampling"""
+        self.profiler.stop_monitoring()
+        st.session_state.performance_monitoring = False
+    
+    def _render_live_metrics(self):
+        """Render current system metrics and the real-time chart"""
         # Current system metrics
         st.subheader("💻 当前系统状态")
         
-        # Get current metrics
+        # Get current metrics; this one snapshot feeds every widget below
         memory_info = self.memory_monitor.get_memory_info()
         current_metrics = self.profiler.get_current_metrics()
         
-        # Display metrics in columns
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            cpu_usage = current_metrics.cpu_usage if current_metrics else 0
-            st.metric(
-                "CPU 使用率", 
+        # Display metrics as one table
+        cpu_usage = current_metrics.cpu_usage if current_metrics else 0
+        active_threads = current_metrics.active_threads if current_metrics else 0
+        _render_metric_table({
+            '指标': ["CPU 使用率", "内存使用率", "可用内存", "活跃线程"],
+            '值': [
                 f"{cpu_usage:.1f}%",
-                delta=None,
-                delta_color="inverse"
-            )
-        
-        with col2:
-            memory_usage = memory_info['usage_percent']
-            st.metric(
-                "内存使用率", 
-                f"{memory_usage:.1f}%",
-                delta=None,
-                delta_color="inverse"
-            )
-        
-        with col3:
-            available_memory = memory_info['available_mb']
-            st.metric(
-                "可用内存", 
-                f"{available_memory:.0f} MB",
-                delta=None
-            )
-        
-        with col4:
-            active_threads = current_metrics.active_threads if current_metrics else 0
-            st.metric(
-                "活跃线程", 
-                str(active_threads),
-                delta=None
-            )
+                f"{memory_info['usage_percent']:.1f}%",
+                f"{memory_info['available_mb']:.0f} MB",
+                str(active_threads)
+            ]
+        })
         
         # Memory usage breakdown
         st.subheader("💾 内存使用详情")
@@ -139,24 +227,12 @@ class PerformanceMonitoringPanel:
         col1, col2 = st.columns(2)
         
         with col1:
-            # Memory usage pie chart
-            memory_data = {
-                '已使用': memory_info['used_mb'],
-                '可用': memory_info['available_mb']
-            }
-            
-            fig_memory = go.Figure(data=[go.Pie(
-                labels=list(memory_data.keys()),
-                values=list(memory_data.values()),
-                hole=0.3
-            )])
-            
-            fig_memory.update_layout(
-                title="内存使用分布",
-                height=300
+            # Memory usage bar; a two-value split does not need a Plotly figure
+            st.write("**内存使用分布:**")
+            st.progress(
+                min(memory_info['usage_percent'] / 100, 1.0),
+                text=f"已使用 {memory_info['used_mb']:.0f} MB / 可用 {memory_info['available_mb']:.0f} MB"
             )
-            
-            st.plotly_chart(fig_memory, width='stretch')
         
         with col2:
             # Process memory info
@@ -168,88 +244,93 @@ class PerformanceMonitoringPanel:
             st.write(f"- 系统总内存: {memory_info['total_mb']:.0f} MB")
             
             # Memory recommendations
-            recommendations = self.memory_optimizer.get_memory_recommendations()
+            recommendations = self.memory_optimizer.get_memory_recommendations(memory_info)
             if recommendations:
                 st.write("**内存建议:**")
                 for rec in recommendations:
                     st.warning(f"⚠️ {rec}")
         
         # Real-time performance chart
-        fig = None
-        if st.session_state.performance_monitoring and self.profiler.metrics_history:
+        if st.session_state.performance_monitoring and self.profiler.get_current_metrics():
             st.subheader("📈 实时性能图表")
             
             # Get recent metrics (last 50 data points)
-            recent_metrics = self.profiler.metrics_history[-50:]
+            recent_metrics = self.profiler.get_metrics_columns(
+                last=50, fields=('timestamp', 'cpu_usage', 'memory_usage')
+            )
             
-            # Initialize fig variable
-            fig = go.Figure()
+            fig = self._update_live_figure(
+                recent_metrics['timestamp'],
+                recent_metrics['cpu_usage'],
+                recent_metrics['memory_usage']
+            )
+            st.plotly_chart(fig, width='stretch')
+        elif st.session_state.performance_monitoring:
+            st.info("正在采集首个性能样本，图表将在下次刷新时显示。")
+        else:
+            st.info("开启监控后将显示实时性能图表。")
+    
+    def _update_live_figure(self, timestamps: np.ndarray, cpu_data: np.ndarray,
+                            memory_data: np.ndarray) -> go.Figure:
+        """
+        Get the session's real-time chart with its traces set to the latest samples
+        
+        Args:
+            timestamps: Sample times
+            cpu_data: CPU usage per sample
+            memory_data: Memory usage per sample
             
-            if recent_metrics:
-                # Create performance chart
-                timestamps = [m.timestamp for m in recent_metrics]
-                cpu_data = [m.cpu_usage for m in recent_metrics]
-                memory_data = [m.memory_usage for m in recent_metrics]
-                
-                fig = make_subplots(
-                    rows=2, cols=1,
-                    subplot_titles=('CPU 使用率 (%)', '内存使用率 (%)'),
-                    vertical_spacing=0.1
-                )
-                
-                # CPU usage
-                fig.add_trace(
+        Returns:
+            Plotly figure kept in session state
+        """
+        fig = st.session_state.get('performance_live_figure')
+        if fig is None:
+            fig = make_subplots(
+                rows=2, cols=1,
+                subplot_titles=('CPU 使用率 (%)', '内存使用率 (%)'),
+                vertical_spacing=0.1
+            )
+            
+            # CPU and memory usage, added in one call
+            fig.add_traces(
+                [
                     go.Scatter(
-                        x=timestamps, 
-                        y=cpu_data,
-                        mode='lines+markers',
+                        mode='lines',
                         name='CPU',
                         line=dict(color='blue')
                     ),
-                    row=1, col=1
-                )
-                
-                # Memory usage
-                fig.add_trace(
                     go.Scatter(
-                        x=timestamps, 
-                        y=memory_data,
-                        mode='lines+markers',
+                        mode='lines',
                         name='Memory',
                         line=dict(color='red')
-                    ),
-                    row=2, col=1
-                )
-                
-                fig.update_layout(
-                    height=400,
-                    showlegend=False,
-                    title="系统性能实时监控"
-                )
-            else:
-                # Create empty chart with message
-                fig.add_annotation(
-                    text="暂无性能数据",
-                    xref="paper",
-                    yref="paper",
-                    x=0.5,
-                    y=0.5,
-                    showarrow=False,
-                    font=dict(size=20)
-                )
-                fig.update_layout(
-                    height=400,
-                    title="系统性能实时监控"
-                )
-        if fig is not None:
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("开启监控后将显示实时性能图表。")
+                    )
+                ],
+                rows=[1, 2], cols=[1, 1]
+            )
+            
+            fig.update_layout(
+                height=400,
+                showlegend=False,
+                title="系统性能实时监控"
+            )
+            st.session_state.performance_live_figure = fig
+        
+        # Layout and traces are built once per session; repaints only swap the data
+        with fig.batch_update():
+            fig.data[0].x = timestamps
+            fig.data[0].y = cpu_data
+            fig.data[1].x = timestamps
+            fig.data[1].y = memory_data
+        
+        return fig
     
     def _render_performance_optimization(self):
         """Render performance optimization tab"""
         st.subheader("🔧 性能优化工具")
         
+        # One memory snapshot per render, shared by the status and resource sections
+        memory_info = self.memory_monitor.get_memory_info()
+        
         # Memory optimization
         st.write("### 💾 内存优化")
         
@@ -263,7 +344,7 @@ class PerformanceMonitoringPanel:
                     st.rerun()
         
         with col2:
-            memory_usage = self.memory_monitor.get_memory_usage()
+            memory_usage = memory_info['usage_percent'] / 100
             if memory_usage > 0.8:
                 st.error(f"⚠️ 高内存使用: {memory_usage:.1%}")
             elif memory_usage > 0.6:
@@ -299,29 +380,28 @@ class PerformanceMonitoringPanel:
         st.write("### 📊 系统资源分析")
         
         # Get system info
-        import psutil
+        cpu_info = _static_cpu_info()
+        system_info = _dynamic_system_info()
         
         col1, col2, col3 = st.columns(3)
         
         with col1:
             st.write("**CPU 信息:**")
-            st.write(f"- 物理核心: {psutil.cpu_count(logical=False)}")
-            st.write(f"- 逻辑核心: {psutil.cpu_count(logical=True)}")
-            st.write(f"- 当前频率: {psutil.cpu_freq().current:.0f} MHz")
+            st.write(f"- 物理核心: {cpu_info['physical_cores']}")
+            st.write(f"- 逻辑核心: {cpu_info['logical_cores']}")
+            st.write(f"- 当前频率: {system_info['cpu_freq_mhz']:.0f} MHz")
         
         with col2:
             st.write("**内存信息:**")
-            memory_info = self.memory_monitor.get_memory_info()
             st.write(f"- 总内存: {memory_info['total_mb']:.0f} MB")
             st.write(f"- 可用内存: {memory_info['available_mb']:.0f} MB")
             st.write(f"- 使用率: {memory_info['usage_percent']:.1f}%")
         
         with col3:
             st.write("**磁盘信息:**")
-            disk_usage = psutil.disk_usage('.')
-            st.write(f"- 总空间: {disk_usage.total / (1024**3):.1f} GB")
-            st.write(f"- 可用空间: {disk_usage.free / (1024**3):.1f} GB")
-            st.write(f"- 使用率: {(disk_usage.used / disk_usage.total) * 100:.1f}%")
+            st.write(f"- 总空间: {system_info['disk_total_gb']:.1f} GB")
+            st.write(f"- 可用空间: {system_info['disk_free_gb']:.1f} GB")
+            st.write(f"- 使用率: {system_info['disk_usage_percent']:.1f}%")
     
     def _render_cache_management(self):
         """Render cache management tab"""
@@ -333,23 +413,16 @@ class PerformanceMonitoringPanel:
         # Cache statistics
         st.write("### 📊 缓存统计")
         
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            hit_rate = cache_stats.get('hit_rate', 0)
-            st.metric("缓存命中率", f"{hit_rate:.1%}")
-        
-        with col2:
-            total_requests = cache_stats.get('total_requests', 0)
-            st.metric("总请求数", str(total_requests))
-        
-        with col3:
-            cache_files = cache_stats.get('cache_files', 0)
-            st.metric("缓存文件数", str(cache_files))
-        
-        with col4:
-            cache_size = cache_stats.get('total_size_mb', 0)
-            st.metric("缓存大小", f"{cache_size:.1f} MB")
+        cache_files = cache_stats.get('cache_files', 0)
+        _render_metric_table({
+            '指标': ["缓存命中率", "总请求数", "缓存文件数", "缓存大小"],
+            '值': [
+                f"{cache_stats.get('hit_rate', 0):.1%}",
+                str(cache_stats.get('total_requests', 0)),
+                str(cache_files),
+                f"{cache_stats.get('total_size_mb', 0):.1f} MB"
+            ]
+        })
         
         # Cache performance chart
         if cache_stats.get('total_requests', 0) > 0:
@@ -358,18 +431,10 @@ class PerformanceMonitoringPanel:
             hits = cache_stats.get('hits', 0)
             misses = cache_stats.get('misses', 0)
             
-            fig = go.Figure(data=[
-                go.Bar(name='命中', x=['缓存性能'], y=[hits], marker_color='green'),
-                go.Bar(name='未命中', x=['缓存性能'], y=[misses], marker_color='red')
-            ])
-            
-            fig.update_layout(
-                barmode='stack',
-                title='缓存命中/未命中统计',
-                height=300
+            st.progress(
+                cache_stats.get('hit_rate', 0),
+                text=f"命中 {hits} / 未命中 {misses}"
             )
-            
-            st.plotly_chart(fig, width='stretch')
         
         # Cache management actions
         st.write("### 🔧 缓存操作")
@@ -422,7 +487,7 @@ class PerformanceMonitoringPanel:
         st.subheader("📈 历史性能分析")
         
         # Get historical metrics
-        if not self.profiler.metrics_history:
+        if not self.profiler.get_current_metrics():
             st.info("暂无历史性能数据，请先启动性能监控")
             return
         
@@ -451,43 +516,43 @@ class PerformanceMonitoringPanel:
         # Display summary metrics
         st.write("### 📊 性能摘要")
         
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            avg_cpu = metrics_summary.get('avg_cpu_usage', 0)
-            max_cpu = metrics_summary.get('max_cpu_usage', 0)
-            st.metric("平均 CPU", f"{avg_cpu:.1f}%", f"峰值: {max_cpu:.1f}%")
-        
-        with col2:
-            avg_memory = metrics_summary.get('avg_memory_usage', 0)
-            max_memory = metrics_summary.get('max_memory_usage', 0)
-            st.metric("平均内存", f"{avg_memory:.1f}%", f"峰值: {max_memory:.1f}%")
-        
-        with col3:
-            min_available = metrics_summary.get('min_memory_available', 0)
-            st.metric("最少可用内存", f"{min_available:.0f} MB")
+        avg_cpu = metrics_summary.get('avg_cpu_usage', 0)
+        max_cpu = metrics_summary.get('max_cpu_usage', 0)
+        avg_memory = metrics_summary.get('avg_memory_usage', 0)
+        max_memory = metrics_summary.get('max_memory_usage', 0)
+        min_available = metrics_summary.get('min_memory_available', 0)
+        avg_threads = metrics_summary.get('avg_active_threads', 0)
+        max_threads = metrics_summary.get('max_active_threads', 0)
         
-        with col4:
-            avg_threads = metrics_summary.get('avg_active_threads', 0)
-            max_threads = metrics_summary.get('max_active_threads', 0)
-            st.metric("平均线程数", f"{avg_threads:.0f}", f"峰值: {max_threads}")
+        _render_metric_table({
+            '指标': ["CPU 使用率", "内存使用率", "活跃线程数", "最少可用内存"],
+            '平均': [f"{avg_cpu:.1f}%", f"{avg_memory:.1f}%", f"{avg_threads:.0f}", "-"],
+            '极值': [f"{max_cpu:.1f}%", f"{max_memory:.1f}%", str(max_threads), f"{min_available:.0f} MB"]
+        })
         
         # Historical performance charts
         st.write("### 📈 性能趋势图")
         
         # Filter metrics by time range
-        cutoff_time = datetime.now() - timedelta(hours=hours_back)
-        filtered_metrics = [
-            m for m in self.profiler.metrics_history 
-            if m.timestamp > cutoff_time
-        ]
+        filtered_metrics = self.profiler.get_metrics_columns(
+            hours=hours_back,
+            fields=('timestamp', 'cpu_usage', 'memory_usage', 'memory_available', 'active_threads')
+        )
         
-        if filtered_metrics:
+        if len(filtered_metrics['timestamp']):
             # Create comprehensive performance chart
-            timestamps = [m.timestamp for m in filtered_metrics]
-            cpu_data = [m.cpu_usage for m in filtered_metrics]
-            memory_data = [m.memory_usage for m in filtered_metrics]
-            threads_data = [m.active_threads for m in filtered_metrics]
+            timestamps = filtered_metrics['timestamp']
+            cpu_data = filtered_metrics['cpu_usage']
+            memory_data = filtered_metrics['memory_usage']
+            threads_data = filtered_metrics['active_threads']
+            
+            # Long windows are downsampled so the browser only receives what it can draw.
+            # The datetime64 column is reinterpreted as microseconds and converted to
+            # float once, so the three downsampling passes share one x array
+            x_values = timestamps.view(np.int64).astype(np.float64)
+            cpu_points = _lttb_indices(x_values, cpu_data)
+            memory_points = _lttb_indices(x_values, memory_data)
+            threads_points = _lttb_indices(x_values, threads_data)
             
             fig = make_subplots(
                 rows=3, cols=1,
@@ -495,40 +560,32 @@ class PerformanceMonitoringPanel:
                 vertical_spacing=0.08
             )
             
-            # CPU usage
-            fig.add_trace(
-                go.Scatter(
-                    x=timestamps, 
-                    y=cpu_data,
-                    mode='lines',
-                    name='CPU',
-                    line=dict(color='blue', width=2)
-                ),
-                row=1, col=1
-            )
-            
-            # Memory usage
-            fig.add_trace(
-                go.Scatter(
-                    x=timestamps, 
-                    y=memory_data,
-                    mode='lines',
-                    name='Memory',
-                    line=dict(color='red', width=2)
-                ),
-                row=2, col=1
-            )
-            
-            # Active threads
-            fig.add_trace(
-                go.Scatter(
-                    x=timestamps, 
-                    y=threads_data,
-                    mode='lines',
-                    name='Threads',
-                    line=dict(color='green', width=2)
-                ),
-                row=3, col=1
+            # CPU usage, memory usage and active threads, drawn with WebGL
+            fig.add_traces(
+                [
+                    go.Scattergl(
+                        x=timestamps[cpu_points], 
+                        y=cpu_data[cpu_points],
+                        mode='lines',
+                        name='CPU',
+                        line=dict(color='blue', width=2)
+                    ),
+                    go.Scattergl(
+                        x=timestamps[memory_points], 
+                        y=memory_data[memory_points],
+                        mode='lines',
+                        name='Memory',
+                        line=dict(color='red', width=2)
+                    ),
+                    go.Scattergl(
+                        x=timestamps[threads_points], 
+                        y=threads_data[threads_points],
+                        mode='lines',
+                        name='Threads',
+                        line=dict(color='green', width=2)
+                    )
+                ],
+                rows=[1, 2, 3], cols=[1, 1, 1]
             )
             
             fig.update_layout(
@@ -573,20 +630,8 @@ class PerformanceMonitoringPanel:
         st.write("### 📤 导出性能数据")
         
         if st.button("📊 导出 CSV 数据"):
-            if filtered_metrics:
-                # Convert to DataFrame
-                data = []
-                for m in filtered_metrics:
-                    data.append({
-                        'timestamp': m.timestamp,
-                        'cpu_usage': m.cpu_usage,
-                        'memory_usage': m.memory_usage,
-                        'memory_available': m.memory_available,
-                        'active_threads': m.active_threads
-                    })
-                
-                df = pd.DataFrame(data)
-                csv_data = df.to_csv(index=False)
+            if len(filtered_metrics['timestamp']):
+                csv_data = _metrics_csv(filtered_metrics)
                 
                 st.download_button(
                     label="📥 下载性能数据",
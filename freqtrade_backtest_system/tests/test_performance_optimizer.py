@@ -0,0 +1,325 @@
+"""
+Unit tests for performance optimizer components
+"""
+import functools
+import gc
+import os
+import pickle
+import sys
+import time
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+
+import components.optimization.performance_optimizer as performance_optimizer
+from components.optimization.performance_optimizer import (
+    CacheManager, ConcurrencyOptimizer, MemoryOptimizer, PerformanceMetrics, PerformanceProfiler,
+    _CACHE_SUFFIX, _DEFAULT_CACHE_TTL_HOURS, _GC_THRESHOLDS, _STALE_TEMP_SECONDS, _TEMP_SUFFIX,
+    _cache_file_expiry, _estimate_size, _parse_cache_name
+)
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    """Empty cache directory"""
+    return tmp_path / 'cache'
+
+
+def _cache_files(cache_manager: CacheManager, key: str):
+    """List the names of the cache files held for a key"""
+    return [e.name for e in cache_manager._scan_cache_files() if _parse_cache_name(e.name)[0] == key]
+
+
+class TestCacheFileNames:
+    """Test cases for expiry encoded in cache file names"""
+    
+    def test_parse_cache_name(self):
+        """Test keys and expiry epochs are split from file names"""
+        assert _parse_cache_name(f"result.1700000000{_CACHE_SUFFIX}") == ('result', 1700000000)
+        assert _parse_cache_name(f"a.b.1700000000{_CACHE_SUFFIX}") == ('a.b', 1700000000)
+        assert _parse_cache_name(f"result{_CACHE_SUFFIX}") == ('result', None)
+        assert _parse_cache_name(f"v1.2{_CACHE_SUFFIX}") == ('v1', 2)
+        assert _parse_cache_name(f"v1.x{_CACHE_SUFFIX}") == ('v1.x', None)
+    
+    def test_legacy_file_expiry_uses_mtime(self, tmp_path):
+        """Test legacy files without an expiry fall back to mtime plus the default TTL"""
+        legacy_file = tmp_path / f"old{_CACHE_SUFFIX}"
+        legacy_file.write_bytes(b'')
+        os.utime(legacy_file, (1000, 1000))
+        
+        assert _cache_file_expiry(legacy_file) == 1000 + _DEFAULT_CACHE_TTL_HOURS * 3600
+        assert _cache_file_expiry(tmp_path / f"new.1700000000{_CACHE_SUFFIX}") == 1700000000
+
+
+class TestCacheManager:
+    """Test cases for CacheManager class"""
+    
+    def test_set_replaces_previous_file(self, cache_dir):
+        """Test a new TTL for a key replaces its old cache file"""
+        cache_manager = CacheManager(str(cache_dir))
+        cache_manager.set('key', 1, ttl_hours=1)
+        cache_manager.set('key', 2, ttl_hours=2)
+        
+        assert len(_cache_files(cache_manager, 'key')) == 1
+        cache_manager.clear_memory_cache()
+        assert cache_manager.get('key') == 2
+    
+    def test_index_built_on_startup(self, cache_dir):
+        """Test files written by an earlier instance are found through the index"""
+        CacheManager(str(cache_dir)).set('key', {'a': 1})
+        
+        cache_manager = CacheManager(str(cache_dir))
+        assert 'key' in cache_manager._key_paths
+        assert cache_manager.get('key') == {'a': 1}
+    
+    def test_get_sees_keys_written_by_another_instance(self, cache_dir):
+        """Test an index miss falls back to the key's shard"""
+        reader = CacheManager(str(cache_dir))
+        writer = CacheManager(str(cache_dir))
+        assert reader.get('late') is None
+        
+        writer.set('late', 7)
+        assert reader.get('late') == 7
+        
+        # A rewrite by the other instance removes the file the reader indexed
+        writer.set('late', 8, ttl_hours=48)
+        reader.clear_memory_cache()
+        assert reader.get('late') == 8
+    
+    def test_legacy_top_level_file(self, cache_dir):
+        """Test legacy {key}.cache files are still read, on startup and on an index miss"""
+        cache_manager = CacheManager(str(cache_dir))
+        with open(cache_dir / f"old{_CACHE_SUFFIX}", 'wb') as f:
+            pickle.dump({'value': 'legacy'}, f)
+        
+        assert cache_manager.get('old') == 'legacy'
+        assert CacheManager(str(cache_dir)).get('old') == 'legacy'
+    
+    def test_expired_file_is_removed(self, cache_dir):
+        """Test expired entries miss and their files are deleted"""
+        cache_manager = CacheManager(str(cache_dir))
+        cache_manager.set('key', 1, ttl_hours=-1)
+        cache_manager.clear_memory_cache()
+        
+        assert cache_manager.get('key', 'missing') == 'missing'
+        assert _cache_files(cache_manager, 'key') == []
+        assert 'key' not in cache_manager._key_paths
+    
+    def test_cleanup_removes_expired_files(self, cache_dir):
+        """Test cleanup deletes expired files and keeps live ones"""
+        cache_manager = CacheManager(str(cache_dir))
+        cache_manager.set('old', 1, ttl_hours=-1)
+        cache_manager.set('new', 2)
+        cache_manager._cleanup_cache()
+        
+        assert _cache_files(cache_manager, 'old') == []
+        assert len(_cache_files(cache_manager, 'new')) == 1
+        assert 'old' not in cache_manager._key_paths
+    
+    def test_cleanup_removes_stale_temp_files(self, cache_dir):
+        """Test temporary files left by a crashed writer are removed once stale"""
+        cache_manager = CacheManager(str(cache_dir))
+        cache_manager.set('key', 1)
+        shard_dir = cache_manager._key_paths['key'].parent
+        stale_file = shard_dir / f"key.1{_CACHE_SUFFIX}abc{_TEMP_SUFFIX}"
+        fresh_file = shard_dir / f"key.2{_CACHE_SUFFIX}def{_TEMP_SUFFIX}"
+        stale_file.write_bytes(b'partial')
+        fresh_file.write_bytes(b'writing')
+        old = time.time() - _STALE_TEMP_SECONDS - 60
+        os.utime(stale_file, (old, old))
+        
+        cache_manager._cleanup_cache()
+        assert not stale_file.exists()
+        assert fresh_file.exists()
+        assert len(_cache_files(cache_manager, 'key')) == 1
+        
+        cache_manager.clear_cache()
+        assert not fresh_file.exists()
+    
+    def test_memory_tier_counts_nested_contents(self, cache_dir):
+        """Test the memory budget sees the contents of containers, not just their headers"""
+        cache_manager = CacheManager(str(cache_dir), max_cache_size_mb=1)
+        rows = [str(i) * 200 for i in range(2000)]
+        assert sys.getsizeof(rows) < 1024 * 1024 // 4 < _estimate_size(rows)
+        
+        cache_manager.set('rows', rows)
+        assert 'rows' not in cache_manager._memory_cache
+        assert cache_manager._memory_bytes == 0
+        assert cache_manager.get('rows') == rows
+        
+        cache_manager.set('small', {'a': [1, 2, 3]})
+        assert 'small' in cache_manager._memory_cache
+    
+    def test_estimate_size_of_arrays_and_frames(self):
+        """Test arrays and frames are sized from their buffers"""
+        pd = pytest.importorskip('pandas')
+        array = np.zeros(1000)
+        assert _estimate_size(array) == array.nbytes
+        frame = pd.DataFrame({'pair': ['BTC/USDT'] * 100, 'profit': np.ones(100)})
+        assert _estimate_size(frame) == frame.memory_usage(deep=True).sum()
+    
+    def test_file_in_use_does_not_break_set(self, cache_dir, monkeypatch):
+        """Test a cache file that cannot be deleted (open on Windows) leaves set and get working"""
+        cache_manager = CacheManager(str(cache_dir))
+        cache_manager.set('key', 1, ttl_hours=1)
+        
+        def locked_unlink(path):
+            raise PermissionError(13, 'file in use', str(path))
+        monkeypatch.setattr(performance_optimizer.os, 'unlink', locked_unlink)
+        
+        cache_manager.set('key', 2, ttl_hours=2)
+        cache_manager.clear_memory_cache()
+        assert cache_manager.get('key') == 2
+        
+        cache_manager._remove_cache_file('key', cache_manager._key_paths['key'])
+        assert 'key' not in cache_manager._key_paths
+        cache_manager._cleanup_cache()
+        cache_manager.clear_cache()
+
+
+def _sample(i: int, timestamp: datetime) -> PerformanceMetrics:
+    """Build a distinguishable metrics sample"""
+    return PerformanceMetrics(float(i), 50.0 + i % 7, 1000.0 - i, 10.0, 2 + i % 5, 0.0, 0.0, timestamp)
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    """Profiler with a ten-sample ring buffer"""
+    monkeypatch.setattr(performance_optimizer, '_METRICS_CAPACITY', 10)
+    return PerformanceProfiler()
+
+
+def _fill(profiler: PerformanceProfiler, count: int, step_minutes: int = 10):
+    """Record count samples ending now, step_minutes apart, and return them"""
+    now = datetime.now()
+    samples = [_sample(i, now - timedelta(minutes=step_minutes * (count - 1 - i))) for i in range(count)]
+    for sample in samples:
+        profiler._record_metrics(sample)
+    return samples
+
+
+class TestPerformanceProfiler:
+    """Test cases for the PerformanceProfiler ring buffer"""
+    
+    def test_empty(self, profiler):
+        """Test an empty profiler returns no samples"""
+        with pytest.deprecated_call():
+            assert profiler.metrics_history == []
+        assert profiler.get_current_metrics() is None
+        assert profiler.get_metrics_summary() == {}
+        columns = profiler.get_metrics_columns(last=5)
+        assert all(len(values) == 0 for values in columns.values())
+        assert columns['timestamp'].dtype == np.dtype('datetime64[us]')
+    
+    def test_overwrites_oldest_when_full(self, profiler):
+        """Test a full ring keeps only the newest samples, oldest first"""
+        samples = _fill(profiler, 25)
+        
+        with pytest.deprecated_call():
+            assert profiler.metrics_history == samples[-10:]
+        assert profiler.get_current_metrics() is samples[-1]
+        assert profiler.get_metrics_columns()['cpu_usage'].tolist() == [s.cpu_usage for s in samples[-10:]]
+    
+    def test_metrics_history_capped(self, profiler, monkeypatch):
+        """Test the deprecated history list keeps only the legacy window of newest samples"""
+        monkeypatch.setattr(performance_optimizer, '_LEGACY_HISTORY_SIZE', 4)
+        samples = _fill(profiler, 14)
+        
+        with pytest.deprecated_call():
+            history = profiler.metrics_history
+        assert history == samples[-4:]
+        assert history[0].timestamp == samples[-4].timestamp
+    
+    def test_last_window_across_wrap(self, profiler):
+        """Test the newest-N window is ordered correctly when it spans the wrap point"""
+        samples = _fill(profiler, 14)
+        
+        for last in (1, 3, 4, 5, 10, 50):
+            columns = profiler.get_metrics_columns(last=last, fields=('cpu_usage', 'timestamp'))
+            assert set(columns) == {'cpu_usage', 'timestamp'}
+            assert columns['cpu_usage'].tolist() == [s.cpu_usage for s in samples[-10:][-last:]]
+            assert columns['timestamp'].tolist() == [s.timestamp for s in samples[-10:][-last:]]
+    
+    def test_hours_window_across_wrap(self, profiler):
+        """Test the time window picks samples from both runs of a wrapped ring"""
+        samples = _fill(profiler, 14)
+        
+        for hours in (0.01, 0.25, 0.6, 1, 48):
+            cutoff = datetime.now() - timedelta(hours=hours)
+            expected = [s.cpu_usage for s in samples[-10:] if s.timestamp > cutoff]
+            assert profiler.get_metrics_columns(hours=hours)['cpu_usage'].tolist() == expected
+            assert profiler.get_metrics_columns(hours=hours, last=2)['cpu_usage'].tolist() == expected[-2:]
+    
+    def test_columns_are_copies(self, profiler):
+        """Test returned columns are not overwritten by later samples"""
+        _fill(profiler, 10)
+        columns = profiler.get_metrics_columns()
+        before = columns['cpu_usage'].tolist()
+        
+        _fill(profiler, 10)
+        assert columns['cpu_usage'].tolist() == before
+    
+    def test_summary(self, profiler):
+        """Test the summary reduces the samples inside the window"""
+        samples = _fill(profiler, 14)
+        recent = [s for s in samples[-10:] if s.timestamp > datetime.now() - timedelta(hours=1)]
+        
+        summary = profiler.get_metrics_summary(hours=1)
+        assert summary['avg_cpu_usage'] == pytest.approx(sum(s.cpu_usage for s in recent) / len(recent))
+        assert summary['max_cpu_usage'] == max(s.cpu_usage for s in recent)
+        assert summary['min_memory_available'] == min(s.memory_available for s in recent)
+        assert summary['max_active_threads'] == max(s.active_threads for s in recent)
+    
+    def test_summary_cache_invalidated_by_new_sample(self, profiler):
+        """Test a cached summary is reused until a new sample arrives"""
+        _fill(profiler, 14)
+        first = profiler.get_metrics_summary(hours=1)
+        second = profiler.get_metrics_summary(hours=1)
+        assert first == second and first is not second
+        assert len(profiler._summary_cache) == 1
+        
+        first['max_cpu_usage'] = -1.0
+        assert profiler.get_metrics_summary(hours=1)['max_cpu_usage'] != -1.0
+        
+        profiler._record_metrics(PerformanceMetrics(500.0, 99.0, 1.0, 1.0, 99, 0.0, 0.0, datetime.now()))
+        assert profiler._summary_cache == {}
+        summary = profiler.get_metrics_summary(hours=1)
+        assert summary['max_cpu_usage'] == 500.0
+        assert summary['max_active_threads'] == 99
+
+
+class TestConcurrencyOptimizer:
+    """Test cases for CPU-bound batches on the shared process pool"""
+    
+    def test_pool_replaced_after_worker_dies(self):
+        """Test a task that kills its worker does not break later batches"""
+        optimizer = ConcurrencyOptimizer()
+        tasks = [functools.partial(pow, 2, i) for i in range(4)]
+        
+        results = optimizer.optimize_execution_batch([functools.partial(os._exit, 1)] + tasks, cpu_bound=True)
+        assert results[0] is None
+        assert optimizer.optimize_execution_batch(tasks, cpu_bound=True) == [1, 2, 4, 8]
+    
+    def test_unpicklable_task_fails_alone(self, monkeypatch):
+        """Test a task that cannot be pickled fails without aborting the batch"""
+        monkeypatch.setattr(performance_optimizer, 'HAS_CLOUDPICKLE', False)
+        optimizer = ConcurrencyOptimizer()
+        tasks = [functools.partial(pow, 2, 3), lambda: 1, functools.partial(pow, 3, 2)]
+        
+        assert optimizer.optimize_execution_batch(tasks, cpu_bound=True) == [8, None, 9]
+    
+    def test_gc_thresholds_tuned_only_in_workers(self, monkeypatch):
+        """Test the process-wide gc tuning reaches pool workers but not the calling process by default"""
+        monkeypatch.setattr(performance_optimizer, '_gc_thresholds_set', False)
+        before = gc.get_threshold()
+        MemoryOptimizer()
+        assert gc.get_threshold() == before
+        
+        results = ConcurrencyOptimizer().optimize_execution_batch([gc.get_threshold], cpu_bound=True)
+        assert results == [_GC_THRESHOLDS]
+        
+        try:
+            MemoryOptimizer(tune_gc=True)
+            assert gc.get_threshold() == _GC_THRESHOLDS
+        finally:
+            gc.set_threshold(*before)
@@ -0,0 +1,69 @@
+"""
+Unit tests for performance panel chart helpers
+"""
+import numpy as np
+
+from components.optimization.performance_panel import _lttb_indices
+
+
+def _reference_lttb(x, y, n_out):
+    """Plain-loop Largest-Triangle-Three-Buckets, following the published algorithm"""
+    n = len(x)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = [0]
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < n_out - 1:
+            next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+            next_x, next_y = np.mean(x[next_start:next_end]), np.mean(y[next_start:next_end])
+        else:
+            next_x, next_y = x[-1], y[-1]
+        ax, ay = x[selected[-1]], y[selected[-1]]
+        areas = [abs((ax - next_x) * (y[i] - ay) - (ax - x[i]) * (next_y - ay)) for i in range(start, end)]
+        selected.append(start + int(np.argmax(areas)))
+    selected.append(n - 1)
+    return selected
+
+
+class TestLttbIndices:
+    """Test cases for LTTB chart downsampling"""
+    
+    def test_short_series_kept(self):
+        """Test series no longer than the target are returned whole"""
+        x = np.arange(5)
+        assert _lttb_indices(x, x * 2.0, n_out=5).tolist() == [0, 1, 2, 3, 4]
+        assert _lttb_indices(x, x * 2.0, n_out=2).tolist() == [0, 1, 2, 3, 4]
+        assert _lttb_indices(x[:0], x[:0], n_out=10).tolist() == []
+    
+    def test_one_point_per_bucket(self):
+        """Test output keeps the end points and picks one sorted index per bucket"""
+        x = np.arange(1000)
+        y = np.sin(x / 25.0)
+        indices = _lttb_indices(x, y, n_out=50)
+        
+        assert len(indices) == 50
+        assert indices[0] == 0 and indices[-1] == 999
+        assert np.all(np.diff(indices) > 0)
+        edges = np.linspace(1, 999, 49).astype(int)
+        assert np.all((indices[1:-1] >= edges[:-1]) & (indices[1:-1] < edges[1:]))
+    
+    def test_matches_reference(self):
+        """Test the vectorised buckets match a plain-loop implementation"""
+        rng = np.random.default_rng(7)
+        x = np.cumsum(rng.uniform(0.5, 1.5, 537))
+        y = rng.normal(size=537).cumsum()
+        for n_out in (3, 10, 100, 536):
+            assert _lttb_indices(x, y, n_out=n_out).tolist() == _reference_lttb(x, y, n_out)
+    
+    def test_spike_preserved(self):
+        """Test a single spike survives downsampling"""
+        y = np.zeros(10000)
+        y[4321] = 100.0
+        assert 4321 in _lttb_indices(np.arange(10000), y, n_out=100)
+    
+    def test_datetime_axis(self):
+        """Test datetime64 columns viewed as float microseconds work as the x axis"""
+        timestamps = np.arange('2024-01-01', '2024-01-08', dtype='datetime64[m]').astype('datetime64[us]')
+        y = np.arange(len(timestamps)) % 60
+        indices = _lttb_indices(timestamps.view(np.int64).astype(np.float64), y, n_out=200)
+        assert len(indices) == 200 and indices[-1] == len(timestamps) - 1
@@ -0,0 +1,156 @@
+"""
+Unit tests for report generator component
+"""
+import html
+import json
+import pytest
+from datetime import datetime, date
+
+import components.jupyter_integration.report_generator as report_generator
+from components.jupyter_integration.report_generator import ReportGenerator
+from components.jupyter_integration.template_manager import JupyterTemplateManager
+from utils.data_models import BacktestConfig, PerformanceMetrics, TradeRecord, BacktestResult
+
+
+class _FixedDatetime(datetime):
+    """datetime whose now() is pinned, so reports land in the same second"""
+    
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2024, 3, 1, 12, 0, 0)
+
+
+def _make_result(strategy_name: str = 'TestStrategy', trade_count: int = 3) -> BacktestResult:
+    """Build a backtest result with the given number of trades"""
+    config = BacktestConfig(date(2024, 1, 1), date(2024, 2, 1), '5m', ['BTC/USDT'], 1000, 3)
+    trades = [
+        TradeRecord('BTC/USDT', 'buy', datetime(2024, 1, 2, i), 1.0 + i, 2.0, profit=0.5)
+        for i in range(trade_count)
+    ]
+    return BacktestResult(strategy_name, config, PerformanceMetrics(total_return_pct=1.5, total_trades=trade_count),
+                          trades, datetime(2024, 2, 1))
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    """Report generator writing into a temporary directory at a fixed time"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(report_generator, 'datetime', _FixedDatetime)
+    return ReportGenerator(template_manager=JupyterTemplateManager(str(tmp_path / 'templates')))
+
+
+def _trade_count(report_path) -> int:
+    """Count the trades stored in a JSON report"""
+    return len(json.loads(report_path.read_text(encoding='utf-8'))['trades_data'])
+
+
+class TestReportGenerator:
+    """Test cases for ReportGenerator class"""
+    
+    def test_same_second_reports_do_not_collide(self, generator):
+        """Test reports with different content in the same second get their own files"""
+        with_trades = generator.generate_strategy_report(_make_result(), 'json')
+        without_trades = generator.generate_strategy_report(_make_result(), 'json', include_trades=False)
+        assert with_trades != without_trades
+        
+        # A new result with the same content is a cache hit on the untouched file
+        cached = generator.generate_strategy_report(_make_result(), 'json')
+        assert cached == with_trades
+        assert _trade_count(cached) == 3
+        assert _trade_count(without_trades) == 0
+    
+    def test_json_report_content(self, generator):
+        """Test streamed trades produce the same document as a plain dump"""
+        result = _make_result()
+        report_path = generator.generate_strategy_report(result, 'json')
+        data = json.loads(report_path.read_text(encoding='utf-8'))
+        assert data['trades_data'] == [trade.to_dict() for trade in result.trades]
+        assert data['strategy_name'] == 'TestStrategy'
+    
+    def test_cache_index_survives_restart(self, generator, tmp_path):
+        """Test the persisted index serves reports to a new generator"""
+        report_path = generator.generate_strategy_report(_make_result(), 'json')
+        
+        restarted = ReportGenerator(template_manager=generator.template_manager)
+        assert restarted.generate_strategy_report(_make_result(), 'json') == report_path
+    
+    def test_cache_index_pruned_and_compacted(self, generator):
+        """Test the index drops missing reports, torn lines and repeated keys on load"""
+        kept = generator.generate_strategy_report(_make_result('Kept'), 'json')
+        removed = generator.generate_strategy_report(_make_result('Removed'), 'json')
+        removed.unlink()
+        
+        index_path = generator._cache_index_path
+        with open(index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps([next(iter(generator._report_cache)), str(kept)]) + '\n')
+            f.write('["torn')
+        
+        restarted = ReportGenerator(template_manager=generator.template_manager)
+        assert list(restarted._report_cache.values()) == [str(kept)]
+        lines = index_path.read_text(encoding='utf-8').splitlines()
+        assert [json.loads(line)[1] for line in lines] == [str(kept)]
+    
+    def test_cache_index_size_capped(self, generator, monkeypatch):
+        """Test the index keeps only the newest entries"""
+        monkeypatch.setattr(report_generator, '_REPORT_INDEX_SIZE', 2)
+        paths = [generator.generate_strategy_report(_make_result(f"S{i}"), 'json') for i in range(4)]
+        assert list(generator._report_cache.values()) == [str(path) for path in paths[-2:]]
+        
+        restarted = ReportGenerator(template_manager=generator.template_manager)
+        assert list(restarted._report_cache.values()) == [str(path) for path in paths[-2:]]
+    
+    def test_batch_reports_same_strategy(self, generator):
+        """Test a batch with repeated strategy names keeps every report and indexes them once"""
+        results = [_make_result('S', 1), _make_result('S', 2), _make_result('T', 3), _make_result('T', 4)]
+        results.append(results[0])
+        paths = generator.generate_strategy_reports(results, 'json', max_workers=2)
+        
+        assert len(set(paths[:4])) == 4 and paths[4] == paths[0]
+        assert [_trade_count(path) for path in paths] == [1, 2, 3, 4, 1]
+        
+        # Workers hand their entries to the parent, which is the only index writer
+        assert sorted(generator._report_cache.values()) == sorted(str(path) for path in paths[:4])
+        restarted = ReportGenerator(template_manager=generator.template_manager)
+        assert sorted(restarted._report_cache.values()) == sorted(str(path) for path in paths[:4])
+    
+    def test_simple_report_streams_raw_json(self, generator):
+        """Test Jinja2 and plain segment rendering write the same report from streamed JSON pieces"""
+        job = generator._prepare_report(_make_result('A<&>', 5), 'html', include_trades=True)
+        context = generator._build_report_context('html', job['data'], datetime(2024, 1, 1), job['fragments'])
+        assert not isinstance(context['raw_json'], str)
+        
+        jinja_path = generator._generate_simple_report(job['data'], 'jinja', 'html', datetime(2024, 1, 1), job['fragments'])
+        generator._report_templates = {}
+        plain_path = generator._generate_simple_report(job['data'], 'plain', 'html', datetime(2024, 1, 1), job['fragments'])
+        
+        content = jinja_path.read_text(encoding='utf-8')
+        assert content == plain_path.read_text(encoding='utf-8')
+        assert generator._create_html_report(job['data'], datetime(2024, 1, 1), job['fragments']) == content
+        raw_json = content.split('<pre>')[-1].split('</pre>')[0]
+        assert json.loads(html.unescape(raw_json))['strategy_name'] == 'A<&>'
+    
+    def test_shared_kernel_is_reset_between_notebooks(self, generator, tmp_path):
+        """Test a reused kernel does not leak variables and a failed run gets a fresh kernel"""
+        pytest.importorskip('ipykernel')
+        nbformat = pytest.importorskip('nbformat')
+        if not report_generator.HAS_NBCONVERT:
+            pytest.skip('nbclient is not installed')
+        
+        def notebook(name, *sources):
+            path = tmp_path / name
+            nbformat.write(nbformat.v4.new_notebook(cells=[nbformat.v4.new_code_cell(s) for s in sources]), str(path))
+            return path
+        
+        try:
+            generator._execute_notebook(notebook('first.ipynb', 'leaked = 1'))
+            kernel_manager = generator._kernel_manager
+            executed = generator._execute_notebook(notebook('second.ipynb', "print('leaked' in dir())"))
+            assert nbformat.read(str(executed), as_version=4).cells[0].outputs[0]['text'].strip() == 'False'
+            assert generator._kernel_manager is kernel_manager
+            
+            failed = notebook('failed.ipynb', 'raise ValueError("boom")')
+            assert generator._execute_notebook(failed) == failed
+            assert generator._kernel_manager is None
+            assert generator._execute_notebook(notebook('after.ipynb', '1')).name == 'executed_after.ipynb'
+        finally:
+            generator.close()
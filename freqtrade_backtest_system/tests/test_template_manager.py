@@ -0,0 +1,100 @@
+"""
+Unit tests for Jupyter template manager component
+"""
+import json
+import pytest
+from datetime import datetime, date
+
+from components.jupyter_integration.template_manager import JupyterTemplateManager, _python_literal
+from components.jupyter_integration.report_generator import ReportGenerator
+from utils.data_models import BacktestConfig, PerformanceMetrics, TradeRecord, BacktestResult
+
+
+def _make_result() -> BacktestResult:
+    """Build a small backtest result with None and bool fields in its payload"""
+    config = BacktestConfig(date(2024, 1, 1), date(2024, 2, 1), '5m', ['BTC/USDT'], 1000, 3)
+    trades = [TradeRecord('BTC/USDT', 'buy', datetime(2024, 1, 2), 1.0, 2.0)]
+    return BacktestResult('TestStrategy', config, PerformanceMetrics(total_return_pct=1.5, total_trades=1),
+                          trades, datetime(2024, 2, 1))
+
+
+class TestJupyterTemplateManager:
+    """Test cases for JupyterTemplateManager class"""
+    
+    def test_python_literal(self):
+        """Test injected values round-trip as Python expressions"""
+        values = [None, True, 3, 1.5, 'a "quoted"\nline', {'flag': False, 'run_id': None, 'items': [1, None]}, [True]]
+        for value in values:
+            assert eval(_python_literal(value), {'json': json}) == value
+        assert str(eval(_python_literal(float('nan')))) == 'nan'
+        assert eval(_python_literal(datetime(2024, 1, 2))) == '2024-01-02 00:00:00'
+    
+    def test_python_literal_is_readable(self):
+        """Test containers use Python displays, wrapped one item per line when long"""
+        class Name(str):
+            pass
+        
+        assert _python_literal({'flag': False, 'run_id': None}) == "{'flag': False, 'run_id': None}"
+        assert _python_literal((1, 2.5)) == '[1, 2.5]'
+        assert _python_literal(Name("O'Neil")) == '"O\'Neil"'
+        
+        trades = [{'pair': 'BTC/USDT', 'profit': 0.5, 'is_open': False, 'index': i} for i in range(40)]
+        source = _python_literal({'trades': trades})
+        assert 'json' not in source and 'null' not in source
+        assert source.splitlines()[:3] == ['{', "    'trades': [", "        {'pair': 'BTC/USDT', 'profit': 0.5, 'is_open': False, 'index': 0},"]
+        assert eval(source) == {'trades': trades}
+    
+    def test_injected_cell_executes(self, tmp_path, monkeypatch):
+        """Test the data cell injected from real report data runs as Python"""
+        nbformat = pytest.importorskip('nbformat')
+        monkeypatch.chdir(tmp_path)
+        
+        manager = JupyterTemplateManager(str(tmp_path / 'templates'))
+        generator = ReportGenerator(template_manager=manager)
+        job = generator._prepare_report(_make_result(), 'html', include_trades=True)
+        notebook_path = generator._create_report_notebook(job['data'], job['report_name'])
+        
+        nb = nbformat.read(str(notebook_path), as_version=4)
+        cell = next(c for c in nb.cells if c.source.startswith('# Data injected by template system'))
+        
+        namespace = {}
+        exec(cell.source, namespace)
+        assert namespace['strategy_name'] == 'TestStrategy'
+        assert namespace['config_data'] == job['data']['config_data']
+        assert namespace['trades_data'] == job['data']['trades_data']
+    
+    def test_same_name_templates_are_addressed_by_suffix(self, tmp_path):
+        """Test foo.md can be inspected and deleted without touching foo.ipynb"""
+        manager = JupyterTemplateManager(str(tmp_path / 'templates'))
+        notebook_path = manager.templates_dir / 'foo.ipynb'
+        markdown_path = manager.templates_dir / 'foo.md'
+        notebook_path.write_text('{"cells": [], "metadata": {}, "nbformat": 4, "nbformat_minor": 5}', encoding='utf-8')
+        markdown_path.write_text('# foo', encoding='utf-8')
+        
+        assert manager.get_template_info('foo')['type'] == '.ipynb'
+        assert manager.get_template_info('foo', '.md')['path'] == str(markdown_path)
+        
+        assert manager.delete_template('foo', '.md')
+        assert not markdown_path.exists()
+        assert notebook_path.exists()
+        assert manager.get_template_info('foo', '.md') is None
+        assert not manager.delete_template('foo', '.md')
+    
+    def test_listing_writes_sidecars_and_stays_cached(self, tmp_path):
+        """Test sidecars are written by the listing without invalidating the listing cache"""
+        manager = JupyterTemplateManager(str(tmp_path / 'templates'))
+        templates = manager.get_available_templates()
+        cache = manager._templates_cache
+        notebooks = [t for t in templates if t.file_path.suffix == '.ipynb']
+        assert notebooks
+        
+        for template in notebooks:
+            meta = json.loads(template.file_path.with_name(template.file_path.name + '.meta.json').read_text())
+            assert meta['template_type'] == template.template_type
+            assert meta['size'] == template.file_path.stat().st_size
+        
+        assert manager.get_available_templates() == templates
+        assert manager._templates_cache is cache
+        
+        (manager.templates_dir / 'extra.md').write_text('# Extra', encoding='utf-8')
+        assert 'extra' in [t.name for t in manager.get_available_templates()]